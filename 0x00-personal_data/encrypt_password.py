@@ -1,16 +1,109 @@
 #!/usr/bin/env python3
 """Password Encryption Module"""
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, Iterable, Iterator, Tuple
 import bcrypt
+import math
+import os
+import time
 
+# Target duration of one hash, from which the default work factor
+# (log2 of the key expansion rounds) is calibrated on first use
+BCRYPT_TARGET_MS = float(os.getenv("PERSONAL_DATA_BCRYPT_TARGET_MS", 250))
+# Work factor bounds accepted by bcrypt
+MIN_ROUNDS, MAX_ROUNDS = 4, 31
 
-def hash_password(password: str) -> bytes:
-    """Hash a password and return byte string"""
+
+def hash_password(password: str, rounds: int = None) -> bytes:
+    """Hash a password and return byte string, using the calibrated
+    default work factor unless rounds is given"""
+    if rounds is None:
+        rounds = default_rounds()
     password = str.encode(password)
-    hashed_pwd = bcrypt.hashpw(password, bcrypt.gensalt())
+    hashed_pwd = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
     return hashed_pwd
 
 
 def is_valid(hashed_password: bytes, password: str) -> bool:
     """Validate hashed password"""
     return bcrypt.checkpw(password.encode(), hashed_password)
+
+
+def calibrate_rounds(target_ms: float = 250.0, min_rounds: int = 10) -> int:
+    """Pick the highest work factor whose hash time stays within target_ms
+    on this machine, but never below min_rounds"""
+    sample_rounds = 8
+    elapsed = min(_time_hash(sample_rounds) for _ in range(3))
+    # each extra round doubles the cost of a hash
+    extra = math.floor(math.log2(target_ms / max(elapsed * 1000, 1e-3)))
+    rounds = sample_rounds + extra
+    return max(min_rounds, MIN_ROUNDS, min(rounds, MAX_ROUNDS))
+
+
+@lru_cache(maxsize=None)
+def default_rounds() -> int:
+    """Return the work factor calibrated to BCRYPT_TARGET_MS, measured
+    once on first call"""
+    return calibrate_rounds(BCRYPT_TARGET_MS)
+
+
+def hash_rounds(hashed_password: bytes) -> int:
+    """Return the work factor a bcrypt hash was created with"""
+    return int(hashed_password.split(b'$')[2])
+
+
+def needs_rehash(hashed_password: bytes, rounds: int = None) -> bool:
+    """Check whether a hash was created with a lower work factor than
+    rounds, by default the calibrated one"""
+    if rounds is None:
+        rounds = default_rounds()
+    return hash_rounds(hashed_password) < rounds
+
+
+def _time_hash(rounds: int) -> float:
+    """Time one bcrypt hash at the given work factor, in seconds"""
+    start = time.perf_counter()
+    bcrypt.hashpw(b'calibration', bcrypt.gensalt(rounds))
+    return time.perf_counter() - start
+
+
+def _is_valid_pair(pair: Tuple[bytes, str]) -> bool:
+    """Validate a (hashed_password, password) pair"""
+    return is_valid(*pair)
+
+
+def _ordered_map(func: Callable, iterable: Iterable, workers: int = None,
+                 processes: bool = False) -> Iterator:
+    """Apply func to every item on a thread or process pool, yielding
+    results in input order while keeping at most 2 * workers in flight"""
+    workers = workers or os.cpu_count() or 1
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        window = 2 * workers
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def hash_passwords(passwords: Iterable[str], rounds: int = None,
+                   workers: int = None,
+                   processes: bool = False) -> Iterator[bytes]:
+    """Hash many passwords in parallel, yielding hashes in input order"""
+    if rounds is None:
+        rounds = default_rounds()
+    return _ordered_map(partial(hash_password, rounds=rounds), passwords,
+                        workers, processes)
+
+
+def verify_many(pairs: Iterable[Tuple[bytes, str]], workers: int = None,
+                processes: bool = False) -> Iterator[bool]:
+    """Validate many (hashed_password, password) pairs in parallel,
+    yielding results in input order"""
+    return _ordered_map(_is_valid_pair, pairs, workers, processes)
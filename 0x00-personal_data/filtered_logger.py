@@ -1,40 +1,118 @@
 #!/usr/bin/env python3
 """Filtered Logger Module"""
 
-from typing import List
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import atexit
 import logging
 import mysql.connector
 import os
+import queue
 import re
+import threading
+import time
 
 # User PII fields to be redacted
 PII_FIELDS = ('name', 'email', 'phone', 'ssn', 'password')
 
+# Background listener draining the queue of an asynchronous logger
+_listener = None
+
+# Shared connection pool created by get_db_pool
+_db_pool = None
+
+
+def _redaction_pattern(fields: Tuple[str, ...], separator: str) -> str:
+    """Builds the regex matching any of the fields up to a separator"""
+    return rf'({"|".join(fields)})=.*?{separator}'
+
+
+@lru_cache(maxsize=128)
+def _redactor(fields: Tuple[str, ...], redaction: str,
+              separator: str) -> Callable[[str], str]:
+    """Compiles and caches a single-pass substitution for all fields"""
+    pattern = re.compile(_redaction_pattern(fields, separator))
+    substitution = f"={redaction}{separator}"
+    return partial(pattern.sub, lambda match: match.group(1) + substitution)
+
 
 def filter_datum(fields: List[str], redaction: str,
                  message: str, separator: str) -> str:
     """Obfuscates log message using regex operation"""
-    for field in fields:
-        pattern = rf'{field}=.*?{separator}'
-        substitution = f"{field}={redaction}{separator}"
-        message = re.sub(pattern, substitution, message)
-    return message
+    if not fields:
+        return message
+    return _redactor(tuple(fields), redaction, separator)(message)
+
 
+def get_logger(asynchronous: bool = False) -> logging.Logger:
+    """Creates a Logger object with a StreamHandler
 
-def get_logger() -> logging.Logger:
-    """Creates a Logger object with a StreamHandler"""
+    With asynchronous set, records are put on a queue and redacted and
+    written by a background listener instead of the calling thread.
+    Handlers are only created on the first call; a later call asking for
+    the other mode switches the existing handlers to it, moving them
+    behind a new listener or, through shutdown_logger, back onto the
+    logger. The last requested mode always applies
+    """
+    global _listener
     logger = logging.getLogger("user_data")
     logger.setLevel(logging.INFO)
     logger.propagate = False
+    if logger.handlers and asynchronous == (_listener is not None):
+        return logger
+    if _listener is not None:
+        shutdown_logger()
+        return logger
 
-    formatter = RedactingFormatter(PII_FIELDS)
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    handlers = logger.handlers[:]
+    if not handlers:
+        formatter = RedactingFormatter(PII_FIELDS)
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+
+    if asynchronous:
+        for handler in handlers:
+            logger.removeHandler(handler)
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers,
+                                  respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logger)
+        handlers = [QueueHandler(log_queue)]
+    for handler in handlers:
+        logger.addHandler(handler)
 
     return logger
 
 
+def shutdown_logger(timeout: float = 5.0) -> None:
+    """Flushes and stops the background listener of an asynchronous logger,
+    waiting at most timeout seconds for queued records to be written.
+    The redacting handlers are then attached to the logger directly, so
+    later records are still redacted instead of reaching logging.lastResort
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    logger = logging.getLogger("user_data")
+    for handler in listener.handlers:
+        logger.addHandler(handler)
+    for handler in logger.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    stopper = threading.Thread(target=listener.stop, daemon=True,
+                               name="user_data-log-shutdown")
+    stopper.start()
+    stopper.join(timeout)
+    if not stopper.is_alive():
+        for handler in listener.handlers:
+            handler.flush()
+
+
 def get_db() -> mysql.connector.connection.MySQLConnection:
     """Creates a MySQL database connection object"""
     db_user = os.getenv("PERSONAL_DATA_DB_USERNAME", "root")
@@ -52,10 +130,34 @@ def get_db() -> mysql.connector.connection.MySQLConnection:
     return db
 
 
-def main():
-    """Obtains and logs user details from a database"""
+def get_db_pool(size: int = None) -> 'ConnectionPool':
+    """Returns the shared pool of MySQL connections created by get_db,
+    sized by PERSONAL_DATA_DB_POOL_SIZE unless size is given"""
+    global _db_pool
+    if _db_pool is None:
+        if size is None:
+            size = int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", 5))
+        _db_pool = ConnectionPool(get_db, size)
+    return _db_pool
+
+
+def main(batch_size: int = None):
+    """Obtains and logs user details from a database
+
+    A positive batch_size (or PERSONAL_DATA_BATCH_SIZE) streams the table
+    through an unbuffered cursor and logs each batch of rows in one write
+    """
+    if batch_size is None:
+        batch_size = int(os.getenv("PERSONAL_DATA_BATCH_SIZE", 0))
     logger = get_logger()
     db = get_db()
+
+    if batch_size > 0:
+        for batch in stream_users(db, batch_size):
+            logger.info("\n".join(batch))
+        db.close()
+        return
+
     cursor = db.cursor(dictionary=True)
     cursor.execute("SELECT * FROM users;")
 
@@ -68,6 +170,25 @@ def main():
     db.close()
 
 
+def stream_users(db: mysql.connector.connection.MySQLConnection,
+                 batch_size: int = 1000) -> Iterator[List[str]]:
+    """Yields log messages for the users table in batches of batch_size
+    rows, fetched from an unbuffered cursor so memory use stays flat"""
+    cursor = db.cursor(buffered=False)
+    try:
+        cursor.execute("SELECT * FROM users;")
+        columns = [f"{column}=" for column in cursor.column_names]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield ["; ".join([f"{column}{value}"
+                              for column, value in zip(columns, row)])
+                   for row in rows]
+    finally:
+        cursor.close()
+
+
 class RedactingFormatter(logging.Formatter):
     """Redacting Formatter class
     """
@@ -75,16 +196,165 @@ class RedactingFormatter(logging.Formatter):
     FORMAT = "[HOLBERTON] %(name)s %(levelname)s %(asctime)-15s: %(message)s"
     SEPARATOR = ";"
 
-    def __init__(self, fields: List[str]):
-        """Initialize RedactingFormatter class instance"""
+    def __init__(self, fields: List[str], redact_before_format: bool = False):
+        """Initialize RedactingFormatter class instance
+
+        With redact_before_format set, the record message is redacted
+        before formatting and the result is cached on the record so that
+        other handlers formatting the same record do not redact it again;
+        exception and stack text are redacted as they are formatted
+        """
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self.redact_before_format = redact_before_format
+        self._cache_key = (tuple(fields), self.REDACTION, self.SEPARATOR)
 
     def format(self, record: logging.LogRecord) -> str:
         """Filter values in incoming log records"""
-        log_message = super().format(record)
-        return filter_datum(self.fields, self.REDACTION,
-                            log_message, self.SEPARATOR)
+        if not self.redact_before_format:
+            log_message = super().format(record)
+            return filter_datum(self.fields, self.REDACTION,
+                                log_message, self.SEPARATOR)
+
+        msg, args, exc_text = record.msg, record.args, record.exc_text
+        record.msg, record.args = self.redact_message(record), None
+        if exc_text:
+            record.exc_text = self._redact(exc_text)
+        try:
+            return super().format(record)
+        finally:
+            record.msg, record.args, record.exc_text = msg, args, exc_text
+
+    def formatException(self, ei) -> str:
+        """Format exception text, redacted in redact_before_format mode"""
+        text = super().formatException(ei)
+        return self._redact(text) if self.redact_before_format else text
+
+    def formatStack(self, stack_info: str) -> str:
+        """Format stack text, redacted in redact_before_format mode"""
+        text = super().formatStack(stack_info)
+        return self._redact(text) if self.redact_before_format else text
+
+    def redact_message(self, record: logging.LogRecord) -> str:
+        """Return the redacted record message, computing it at most once"""
+        cached = getattr(record, '_redacted_message', None)
+        if cached is not None and cached[0] == self._cache_key:
+            return cached[1]
+        message = self._redact(record.getMessage())
+        record._redacted_message = (self._cache_key, message)
+        return message
+
+    def _redact(self, text: str) -> str:
+        """Redact the PII fields of a piece of text"""
+        return filter_datum(self.fields, self.REDACTION, text, self.SEPARATOR)
+
+
+class ConnectionPool:
+    """Bounded pool of reusable database connections
+    """
+    def __init__(self, connect: Callable[[], Any], size: int = 5,
+                 timeout: float = 30.0):
+        """Initialize ConnectionPool class instance
+
+        connect is called to open a new connection whenever no healthy
+        idle connection is available and fewer than size are borrowed
+        """
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._borrowed = 0
+        self._borrows = 0
+        self._wait_time = 0.0
+
+    def acquire(self) -> Any:
+        """Borrow a healthy connection, waiting at most timeout seconds"""
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("no database connection available")
+        waited = time.monotonic() - start
+        try:
+            connection = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._borrowed += 1
+            self._borrows += 1
+            self._wait_time += waited
+        return connection
+
+    def release(self, connection: Any) -> None:
+        """Return a borrowed connection to the pool"""
+        with self._lock:
+            self._borrowed -= 1
+        self._idle.put(connection)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Context manager borrowing a connection for the block"""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Close every idle connection"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self) -> Dict[str, float]:
+        """Return borrowed/idle counts and borrow wait time metrics"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'borrowed': self._borrowed,
+                'idle': self._idle.qsize(),
+                'borrows': self._borrows,
+                'wait_time': self._wait_time,
+            }
+
+    def _checkout(self) -> Any:
+        """Pop the most recent healthy idle connection or open a new one"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if self._is_healthy(connection):
+                return connection
+            self._close(connection)
+
+    @staticmethod
+    def _is_healthy(connection: Any) -> bool:
+        """Check a connection is still usable before lending it"""
+        try:
+            if hasattr(connection, 'is_connected'):
+                return connection.is_connected()
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        """Close a connection, ignoring errors from broken ones"""
+        try:
+            connection.close()
+        except Exception:
+            pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: single-pass filter_datum against the per-field loop
+"""
+import re
+import sys
+import time
+
+filter_datum = __import__('filtered_logger').filter_datum
+PII_FIELDS = __import__('filtered_logger').PII_FIELDS
+
+
+def legacy_filter_datum(fields, redaction, message, separator):
+    """Previous implementation: one re.sub per field"""
+    for field in fields:
+        pattern = rf'{field}=.*?{separator}'
+        substitution = f"{field}={redaction}{separator}"
+        message = re.sub(pattern, substitution, message)
+    return message
+
+
+line = ("name=Bob Dylan;email=bob@dylan.com;phone=(473) 401-4253;"
+        "ssn=261-72-6780;password=bobby2019;ip=60ed:c396:2ff:244;"
+        "last_login=2019-11-14 06:14:24;user_agent=Mozilla/5.0;")
+sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+
+assert filter_datum(PII_FIELDS, "***", line, ";") ==\
+    legacy_filter_datum(PII_FIELDS, "***", line, ";")
+
+for size in sizes:
+    for name, func in (("legacy", legacy_filter_datum),
+                       ("single-pass", filter_datum)):
+        start = time.perf_counter()
+        for _ in range(size):
+            func(PII_FIELDS, "***", line, ";")
+        elapsed = time.perf_counter() - start
+        print("{:>8} lines {:>12}: {:.3f}s".format(size, name, elapsed))
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: hash_passwords scaling across worker counts
+"""
+import os
+import sys
+import time
+
+hash_passwords = __import__('encrypt_password').hash_passwords
+verify_many = __import__('encrypt_password').verify_many
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+passwords = ["MyAmazingPassw0rd{}".format(i) for i in range(count)]
+cores = os.cpu_count() or 1
+
+workers = 1
+while workers <= cores:
+    for processes in (False, True):
+        start = time.perf_counter()
+        hashes = list(hash_passwords(passwords, rounds, workers, processes))
+        elapsed = time.perf_counter() - start
+        print("{:>2} {} worker(s): {:>8.1f} hashes/s".format(
+              workers, "process" if processes else "thread",
+              count / elapsed))
+    workers *= 2
+
+assert all(verify_many(zip(hashes, passwords)))
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: RedactingFormatter throughput per handler count
+"""
+import logging
+import os
+import sys
+import time
+
+RedactingFormatter = __import__('filtered_logger').RedactingFormatter
+PII_FIELDS = __import__('filtered_logger').PII_FIELDS
+
+message = ("name=Bob Dylan;email=bob@dylan.com;phone=(473) 401-4253;"
+           "ssn=261-72-6780;password=bobby2019;ip=60ed:c396:2ff:244;")
+records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+devnull = open(os.devnull, 'w')
+
+for handler_count in (1, 2, 4, 8):
+    for before in (False, True):
+        logger = logging.getLogger("bench_{}_{}".format(handler_count, before))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        for _ in range(handler_count):
+            handler = logging.StreamHandler(devnull)
+            handler.setFormatter(RedactingFormatter(PII_FIELDS, before))
+            logger.addHandler(handler)
+
+        start = time.perf_counter()
+        for _ in range(records):
+            logger.info(message)
+        elapsed = time.perf_counter() - start
+        mode = "before-format" if before else "after-format"
+        print("{} handler(s) {:>13}: {:>10.0f} records/s".format(
+              handler_count, mode, records / elapsed))
+
+devnull.close()
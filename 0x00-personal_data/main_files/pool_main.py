@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Main file: ConnectionPool against a local SQLite stand-in database
+"""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+ConnectionPool = __import__('filtered_logger').ConnectionPool
+
+pool = ConnectionPool(lambda: sqlite3.connect(":memory:",
+                                              check_same_thread=False),
+                      size=2)
+
+
+def query(i):
+    with pool.connection() as db:
+        cursor = db.cursor()
+        cursor.execute("SELECT ?;", (i,))
+        return cursor.fetchone()[0]
+
+
+with ThreadPoolExecutor(8) as executor:
+    print(sum(executor.map(query, range(100))))
+print(pool.stats())
+pool.close()
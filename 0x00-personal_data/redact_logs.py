@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Bulk Log Redaction Module"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, List, Tuple
+import argparse
+import mmap
+import os
+import re
+import sys
+
+from filtered_logger import PII_FIELDS, RedactingFormatter, \
+    _redaction_pattern
+
+# Target size in bytes of each chunk handed to a worker process
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def chunk_ranges(path: str, chunk_size: int = CHUNK_SIZE
+                 ) -> List[Tuple[int, int]]:
+    """Splits a file into byte ranges of about chunk_size bytes, each
+    ending on a line boundary"""
+    ranges = []
+    if os.path.getsize(path) == 0:
+        return ranges
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = mm.find(b'\n', end - 1)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+@lru_cache(maxsize=128)
+def _bytes_redactor(fields: Tuple[str, ...], redaction: str,
+                    separator: str) -> Callable[[bytes], bytes]:
+    """Compiles and caches the bytes counterpart of filter_datum's
+    single-pass substitution"""
+    pattern = re.compile(_redaction_pattern(fields, separator).encode())
+    substitution = f"={redaction}{separator}".encode()
+    return partial(pattern.sub, lambda match: match.group(1) + substitution)
+
+
+def redact_chunk(path: str, start: int, end: int, fields: Tuple[str, ...],
+                 redaction: str, separator: str) -> bytes:
+    """Redacts the lines in the byte range [start, end) of a file,
+    matching directly on the mapped bytes"""
+    redact = _bytes_redactor(tuple(fields), redaction, separator)
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view, view[start:end] as chunk:
+        return redact(chunk)
+
+
+def redact_file(path: str, output, fields: Tuple[str, ...] = PII_FIELDS,
+                redaction: str = RedactingFormatter.REDACTION,
+                separator: str = RedactingFormatter.SEPARATOR,
+                workers: int = None, chunk_size: int = CHUNK_SIZE) -> None:
+    """Redacts a log file in parallel chunks and writes the result to the
+    binary stream output in the original line order, keeping at most
+    2 * workers chunks in flight"""
+    ranges = chunk_ranges(path, chunk_size)
+    if not ranges:
+        return
+    workers = workers or os.cpu_count() or 1
+    redact = partial(redact_chunk, path, fields=tuple(fields),
+                     redaction=redaction, separator=separator)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = 2 * workers
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(redact, start, end))
+            if len(pending) >= window:
+                output.write(pending.popleft().result())
+        while pending:
+            output.write(pending.popleft().result())
+
+
+def main():
+    """Redacts PII fields of existing log files from the command line"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('path', help='log file to redact')
+    parser.add_argument('-o', '--output',
+                        help='file to write to (default: stdout)')
+    parser.add_argument('-f', '--fields', nargs='+', default=PII_FIELDS,
+                        help='fields to redact (default: PII_FIELDS)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('-c', '--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='approximate chunk size in bytes')
+    args = parser.parse_args()
+
+    if args.output is None:
+        redact_file(args.path, sys.stdout.buffer, args.fields,
+                    workers=args.workers, chunk_size=args.chunk_size)
+        return
+    with open(args.output, 'wb') as output:
+        redact_file(args.path, output, args.fields,
+                    workers=args.workers, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
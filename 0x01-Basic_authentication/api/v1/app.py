@@ -2,6 +2,7 @@
 """
 Route module for the API
 """
+from api.v1.auth.auth import ExcludedPathMatcher
 from api.v1.views import app_views
 from flask import Flask, jsonify, abort, request
 from flask_cors import (CORS, cross_origin)
@@ -23,6 +24,13 @@ elif auth_type == "basic_auth":
     auth = BasicAuth()
 
 
+EXCLUDED_PATHS = ExcludedPathMatcher([
+    '/api/v1/status/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+])
+
+
 @app.before_request
 def filter_request():
     """ Filter requests
@@ -30,13 +38,10 @@ def filter_request():
     if auth is None:
         pass
     else:
-        excluded_paths = ['/api/v1/status/',
-                          '/api/v1/unauthorized/', '/api/v1/forbidden/']
-
-        if auth.require_auth(request.path, excluded_paths):
+        if auth.require_auth(request.path, EXCLUDED_PATHS):
             if not auth.authorization_header(request):
                 abort(401)
-            if not auth.current_user(request):
+            if not auth.request_user(request):
                 abort(403)
 
 
@@ -2,18 +2,52 @@
 """ Module of Users views
 """
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from flask import abort, jsonify, request, Response, url_for
 from models.user import User
+import json
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters (optional):
+      - limit: maximum number of users returned, ordered by ID
+      - cursor: ID of the last user of the previous page
+      - format: ndjson to stream one User JSON per line
     Return:
       - list of all User objects JSON represented
+      - Link and X-Next-Cursor headers when a next page may exist
+      - 400 if limit isn't a positive integer
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    stream = request.args.get('format') == 'ndjson'
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            return jsonify({'error': "limit must be a positive integer"}), 400
+    if limit is None and cursor is None and not stream:
+        all_users = [user.to_json() for user in User.all()]
+        return jsonify(all_users)
+
+    users = User.page(cursor, limit)
+    if stream:
+        def generate():
+            for user in users:
+                yield json.dumps(user.to_json()) + "\n"
+        response = Response(generate(), mimetype='application/x-ndjson')
+    else:
+        response = jsonify([user.to_json() for user in users])
+    if limit is not None and len(users) == limit:
+        next_cursor = users[-1].id
+        args = dict(request.args, cursor=next_cursor)
+        next_url = url_for('app_views.view_all_users', _external=True, **args)
+        response.headers['Link'] = '<{}>; rel="next"'.format(next_url)
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
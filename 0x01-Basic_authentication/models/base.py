@@ -2,19 +2,36 @@
 """ Base module
 """
 from datetime import datetime
-from typing import TypeVar, List, Iterable
-from os import path
+from typing import TypeVar, List, Iterable, Tuple
+from os import getenv, path
+import bisect
 import json
+import os
 import uuid
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
 DATA = {}
+# number of records in each class journal since the last snapshot
+JOURNAL_SIZES = {}
+# stat signature of each class storage files when DATA was last synced
+FILE_STATES = {}
+# IDs of each class in sorted order, built on first use by page()
+SORTED_IDS = {}
+# secondary indexes: {class: {attribute: {value: {id: None}}}}
+INDEXES = {}
 
 
 class Base():
     """ Base class
     """
+    indexed_attributes: Tuple[str, ...] = ()
+    # append each save/remove to a journal instead of rewriting the file
+    journaled: bool = getenv("DB_STORAGE") == "journal"
+    # compact the journal once it holds this many records...
+    journal_min_size: int = 1000
+    # ...and more records than this ratio of live objects
+    journal_ratio: float = 1.0
 
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
@@ -22,6 +39,7 @@ class Base():
         s_class = str(self.__class__.__name__)
         if DATA.get(s_class) is None:
             DATA[s_class] = {}
+            self.__class__._reset_indexes()
 
         self.id = kwargs.get('id', str(uuid.uuid4()))
         if kwargs.get('created_at') is not None:
@@ -35,6 +53,16 @@ class Base():
         else:
             self.updated_at = datetime.utcnow()
 
+    def __setattr__(self, name: str, value) -> None:
+        """ Set an attribute, keeping secondary indexes current
+        """
+        if name not in self.indexed_attributes or not self._is_stored():
+            object.__setattr__(self, name, value)
+            return
+        self._unindex(name)
+        object.__setattr__(self, name, value)
+        self._index(name)
+
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """ Equality
         """
@@ -59,18 +87,48 @@ class Base():
 
     @classmethod
     def load_from_file(cls):
-        """ Load all objects from file
+        """ Load all objects from file, replaying the journal if any
         """
         s_class = cls.__name__
         file_path = ".db_{}.json".format(s_class)
         DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
+        SORTED_IDS.pop(s_class, None)
+        cls._reset_indexes()
+        objs_json = {}
+        if path.exists(file_path):
+            with open(file_path, 'r') as f:
+                objs_json = json.load(f)
+        JOURNAL_SIZES[s_class] = cls._replay_journal(objs_json)
+
+        for obj_id, obj_json in objs_json.items():
+            obj = cls(**obj_json)
+            DATA[s_class][obj_id] = obj
+            obj._index_all()
+        FILE_STATES[s_class] = cls._file_state()
 
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+    @classmethod
+    def reload_if_changed(cls) -> bool:
+        """ Load all objects from file only if the storage files changed
+        since they were last loaded or written by this process
+        """
+        s_class = cls.__name__
+        if s_class in DATA and FILE_STATES.get(s_class) == cls._file_state():
+            return False
+        cls.load_from_file()
+        return True
+
+    @classmethod
+    def _file_state(cls) -> tuple:
+        """ Return the (inode, size, mtime) of the snapshot and journal
+        """
+        state = ()
+        for ext in ("json", "journal"):
+            try:
+                st = os.stat(".db_{}.{}".format(cls.__name__, ext))
+                state += ((st.st_ino, st.st_size, st.st_mtime_ns),)
+            except OSError:
+                state += (None,)
+        return state
 
     @classmethod
     def save_to_file(cls):
@@ -82,24 +140,88 @@ class Base():
         for obj_id, obj in DATA[s_class].items():
             objs_json[obj_id] = obj.to_json(True)
 
-        with open(file_path, 'w') as f:
+        with open(file_path + ".tmp", 'w') as f:
             json.dump(objs_json, f)
+        os.replace(file_path + ".tmp", file_path)
+        journal_path = ".db_{}.journal".format(s_class)
+        if path.exists(journal_path):
+            os.remove(journal_path)
+        JOURNAL_SIZES[s_class] = 0
+        FILE_STATES[s_class] = cls._file_state()
+
+    @classmethod
+    def _replay_journal(cls, objs_json: dict) -> int:
+        """ Apply the journal records to loaded JSON objects
+        and return the number of records
+        """
+        journal_path = ".db_{}.journal".format(cls.__name__)
+        if not path.exists(journal_path):
+            return 0
+        size = 0
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('op') == 'save':
+                    objs_json[record['id']] = record['obj']
+                else:
+                    objs_json.pop(record['id'], None)
+                size += 1
+        return size
+
+    def _write_journal(self, op: str):
+        """ Append one save/remove record to the journal of the class,
+        compacting it into the snapshot once it grows too large
+        """
+        s_class = self.__class__.__name__
+        record = {'op': op, 'id': self.id}
+        if op == 'save':
+            record['obj'] = self.to_json(True)
+        with open(".db_{}.journal".format(s_class), 'a') as f:
+            f.write(json.dumps(record) + "\n")
+        FILE_STATES[s_class] = self.__class__._file_state()
+
+        size = JOURNAL_SIZES.get(s_class, 0) + 1
+        JOURNAL_SIZES[s_class] = size
+        if size >= self.journal_min_size and \
+                size > self.journal_ratio * len(DATA[s_class]):
+            self.__class__.save_to_file()
 
     def save(self):
         """ Save current object
         """
         s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        stored = DATA[s_class].get(self.id)
+        if stored is not self:
+            if stored is not None:
+                stored._unindex_all()
+            elif s_class in SORTED_IDS:
+                bisect.insort(SORTED_IDS[s_class], self.id)
+            DATA[s_class][self.id] = self
+            self._index_all()
+        if self.journaled:
+            self._write_journal('save')
+        else:
+            self.__class__.save_to_file()
 
     def remove(self):
         """ Remove object
         """
         s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
+        stored = DATA[s_class].get(self.id)
+        if stored is not None:
+            stored._unindex_all()
             del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+            ids = SORTED_IDS.get(s_class)
+            if ids is not None:
+                del ids[bisect.bisect_left(ids, self.id)]
+            if self.journaled:
+                self._write_journal('remove')
+            else:
+                self.__class__.save_to_file()
 
     @classmethod
     def count(cls) -> int:
@@ -114,6 +236,20 @@ class Base():
         """
         return cls.search()
 
+    @classmethod
+    def page(cls, cursor: str = None,
+             limit: int = None) -> List[TypeVar('Base')]:
+        """ Return up to limit objects ordered by ID, starting after the
+        cursor ID
+        """
+        s_class = cls.__name__
+        ids = SORTED_IDS.get(s_class)
+        if ids is None:
+            ids = SORTED_IDS[s_class] = sorted(DATA[s_class])
+        start = 0 if cursor is None else bisect.bisect_right(ids, cursor)
+        end = len(ids) if limit is None else start + limit
+        return [DATA[s_class][obj_id] for obj_id in ids[start:end]]
+
     @classmethod
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
@@ -133,5 +269,80 @@ class Base():
                 if (getattr(obj, k) != v):
                     return False
             return True
-        
+
+        candidates = cls._index_candidates(attributes)
+        if candidates is not None:
+            objs = DATA[s_class]
+            return list(filter(_search, (objs[i] for i in candidates)))
         return list(filter(_search, DATA[s_class].values()))
+
+    @classmethod
+    def _index_candidates(cls, attributes: dict) -> Iterable[str]:
+        """ Return the IDs found through the smallest matching index,
+        or None if no searched attribute is indexed
+        """
+        indexes = INDEXES.get(cls.__name__, {})
+        candidates = None
+        for k, v in attributes.items():
+            if k not in indexes:
+                continue
+            try:
+                ids = indexes[k].get(cls.index_key(k, v), {})
+            except TypeError:
+                continue
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        return None if candidates is None else list(candidates)
+
+    @classmethod
+    def index_key(cls, name: str, value):
+        """ Return the key a value of an indexed attribute is indexed by
+        """
+        return value
+
+    @classmethod
+    def _reset_indexes(cls):
+        """ Drop all secondary indexes of the class
+        """
+        INDEXES[cls.__name__] = {name: {} for name in cls.indexed_attributes}
+
+    def _is_stored(self) -> bool:
+        """ Check if this instance is the one held in DATA
+        """
+        objs = DATA.get(self.__class__.__name__, {})
+        return objs.get(self.__dict__.get('id')) is self
+
+    def _index(self, name: str):
+        """ Add this object to the index of one attribute
+        """
+        value = self.index_key(name, getattr(self, name, None))
+        try:
+            index = INDEXES[self.__class__.__name__][name]
+            index.setdefault(value, {})[self.id] = None
+        except TypeError:
+            pass
+
+    def _unindex(self, name: str):
+        """ Remove this object from the index of one attribute
+        """
+        value = self.index_key(name, getattr(self, name, None))
+        try:
+            index = INDEXES[self.__class__.__name__][name]
+            ids = index.get(value, {})
+        except TypeError:
+            return
+        ids.pop(self.id, None)
+        if not ids:
+            index.pop(value, None)
+
+    def _index_all(self):
+        """ Add this object to every secondary index of its class
+        """
+        for name in self.indexed_attributes:
+            self._index(name)
+
+    def _unindex_all(self):
+        """ Remove this object from every secondary index of its class
+        """
+        for name in self.indexed_attributes:
+            self._unindex(name)
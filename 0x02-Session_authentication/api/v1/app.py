@@ -2,6 +2,7 @@
 """
 Route module for the API
 """
+from api.v1.auth.auth import ExcludedPathMatcher
 from api.v1.views import app_views
 from flask import Flask, jsonify, abort, request
 from flask_cors import (CORS, cross_origin)
@@ -32,6 +33,14 @@ elif AUTH_TYPE == "session_db_auth":
     auth = SessionDBAuth()
 
 
+EXCLUDED_PATHS = ExcludedPathMatcher([
+    '/api/v1/status/',
+    '/api/v1/auth_session/login/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+])
+
+
 @app.before_request
 def filter_request():
     """ Filter requests
@@ -39,16 +48,14 @@ def filter_request():
     if auth is None:
         pass
     else:
-        excluded_paths = ['/api/v1/status/', '/api/v1/auth_session/login/',
-                          '/api/v1/unauthorized/', '/api/v1/forbidden/']
-
-        if auth.require_auth(request.path, excluded_paths):
+        if auth.require_auth(request.path, EXCLUDED_PATHS):
             if not auth.authorization_header(request)\
                     and not auth.session_cookie(request):
                 abort(401)
-            if not auth.current_user(request):
+            user = auth.request_user(request)
+            if not user:
                 abort(403)
-            request.current_user = auth.current_user(request)
+            request.current_user = user
 
 
 @app.errorhandler(401)
@@ -2,20 +2,68 @@
 """
 Auth class module for the API
 """
-from flask import request
+from flask import g, has_request_context, request
 from os import getenv
-from typing import List, TypeVar
+from functools import lru_cache
+from typing import List, TypeVar, Union
+
+
+class ExcludedPathMatcher:
+    """ExcludedPathMatcher compiles a list of excluded paths once: exact
+    paths go in a set and paths ending with '*' in a prefix trie, and
+    results are cached per path
+    """
+    _END = None
+
+    def __init__(self, excluded_paths: List[str], cache_size: int = 1024):
+        """Instantiate new ExcludedPathMatcher class instance
+        """
+        self.excluded_paths = list(excluded_paths)
+        self._exact = set(self.excluded_paths)
+        self._trie = {}
+        for route in self.excluded_paths:
+            if route.endswith('*'):
+                node = self._trie
+                for char in route[:-1]:
+                    node = node.setdefault(char, {})
+                node[self._END] = True
+        self.is_excluded = lru_cache(maxsize=cache_size)(self._is_excluded)
+
+    def __len__(self) -> int:
+        """Return the number of excluded paths
+        """
+        return len(self.excluded_paths)
+
+    def _is_excluded(self, path: str) -> bool:
+        """Confirm path matches an excluded path, ignoring a missing
+        trailing slash
+        """
+        node = self._trie
+        if self._END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                return True
+        slashed_path = path if path.endswith('/') else f'{path}/'
+        return path in self._exact or slashed_path in self._exact
 
 
 class Auth:
     """Auth class manages Simple API Authentication"""
-    def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
+    def require_auth(self, path: str,
+                     excluded_paths: Union[List[str], ExcludedPathMatcher]
+                     ) -> bool:
         """Confirm path route in list of excluded paths
         """
         slashed_path = f'{path}/' if path and not path.endswith('/') else path
 
         if not path or not excluded_paths:
             return True
+        if isinstance(excluded_paths, ExcludedPathMatcher):
+            return not excluded_paths.is_excluded(path)
         for route in excluded_paths:
             if route.endswith('*') and path.startswith(route[:-1]):
                 return False
@@ -35,6 +83,16 @@ class Auth:
         """
         return None
 
+    def request_user(self, request=None) -> TypeVar('User'):
+        """Return current_user for the request being handled, computing it
+        at most once per request and memoizing it on flask.g
+        """
+        if request is None or not has_request_context():
+            return self.current_user(request)
+        if 'auth_user' not in g:
+            g.auth_user = self.current_user(request)
+        return g.auth_user
+
     def session_cookie(self, request=None) -> str:
         """Return a cookie value from a request
         """
@@ -3,15 +3,94 @@
 BasicAuth class module for the API
 """
 from api.v1.auth.auth import Auth
+from collections import OrderedDict
 from models.user import User
+from os import getenv
 from typing import TypeVar
 import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+
+class CredentialCache:
+    """CredentialCache maps a keyed digest of verified Authorization
+    headers to the User ID they authenticated, with LRU eviction and a TTL.
+    Entries are dropped as soon as the user is removed or its email or
+    password changes
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        """Instantiate new CredentialCache class instance
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._key = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, authorization_header: str) -> bytes:
+        """Return the keyed digest of an Authorization header
+        """
+        return hmac.new(self._key, authorization_header.encode(),
+                        hashlib.sha256).digest()
+
+    def get(self, authorization_header: str) -> TypeVar('User'):
+        """Return the User cached for an Authorization header, if the
+        entry is still fresh and the user unchanged
+        """
+        digest = self._digest(authorization_header)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            user_id, email, password, expires = entry
+            if expires < time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+        user = User.get(user_id)
+        if user is None or user.email != email or user.password != password:
+            with self._lock:
+                self._entries.pop(digest, None)
+            return None
+        return user
+
+    def set(self, authorization_header: str, user: TypeVar('User')) -> None:
+        """Cache the User verified for an Authorization header
+        """
+        digest = self._digest(authorization_header)
+        entry = (user.id, user.email, user.password,
+                 time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
 
 
 class BasicAuth(Auth):
     """BasicAuth class inherits from Auth class and implements the
     WWW Basic Authentication scheme
     """
+    def __init__(self):
+        """Instantiate new BasicAuth class instance with a cache of verified
+        credentials sized by BASIC_AUTH_CACHE_SIZE (0 disables it) and
+        expiring after BASIC_AUTH_CACHE_TTL seconds
+        """
+        try:
+            cache_size = int(getenv('BASIC_AUTH_CACHE_SIZE'))
+        except Exception:
+            cache_size = 1024
+        try:
+            cache_ttl = float(getenv('BASIC_AUTH_CACHE_TTL'))
+        except Exception:
+            cache_ttl = 300.0
+        self.credential_cache = None
+        if cache_size > 0 and cache_ttl > 0:
+            self.credential_cache = CredentialCache(cache_size, cache_ttl)
+
     def extract_base64_authorization_header(self, authorization_header:
                                             str) -> str:
         """Returns the Base64 part of the Authorization header
@@ -56,11 +135,8 @@ class BasicAuth(Auth):
         if user_pwd is None or not isinstance(user_pwd, str):
             return None
         try:
-            if not User.all():
-                return None
-            for user in User.search():
-                if user.email == user_email\
-                        and user.is_valid_password(user_pwd):
+            for user in User.find_all_by_email(user_email):
+                if user.is_valid_password(user_pwd):
                     return user
         except Exception:
             return None
@@ -69,6 +145,10 @@ class BasicAuth(Auth):
         """Overloads Auth class and retrieves the User instance for a request
         """
         auth_header = super().authorization_header(request)
+        if auth_header and self.credential_cache is not None:
+            user = self.credential_cache.get(auth_header)
+            if user is not None:
+                return user
         if auth_header:
             header = self.extract_base64_authorization_header(auth_header)
             if header:
@@ -78,4 +158,6 @@ class BasicAuth(Auth):
                     if credential:
                         user = self.user_object_from_credentials(credential[0],
                                                                  credential[1])
+                        if user and self.credential_cache is not None:
+                            self.credential_cache.set(auth_header, user)
                         return user
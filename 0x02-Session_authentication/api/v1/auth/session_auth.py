@@ -3,7 +3,9 @@
 SessionAuth class module for the API
 """
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import get_session_store
 from models.user import User
+from os import getenv
 from typing import TypeVar
 from uuid import uuid4
 
@@ -14,6 +16,13 @@ class SessionAuth(Auth):
     """
     user_id_by_session_id = {}
 
+    def __init__(self):
+        """Instantiate new SessionAuth class instance, using the session
+        store selected by SESSION_STORE instead of the in-process dictionary
+        """
+        if getenv('SESSION_STORE'):
+            self.user_id_by_session_id = get_session_store()
+
     def create_session(self, user_id: str = None) -> str:
         """Create a Session ID for a User ID
         """
@@ -52,5 +61,5 @@ class SessionAuth(Auth):
         user_id = self.user_id_for_session_id(session_id)
         if user_id is None:
             return False
-        del self.user_id_by_session_id[session_id]
+        self.user_id_by_session_id.pop(session_id, None)
         return True
@@ -3,19 +3,51 @@
 SessionDBAuth class module for the API
 """
 from api.v1.auth.session_exp_auth import SessionExpAuth
+from api.v1.auth.session_store import SessionRecord
 from models.user_session import UserSession
 
+from datetime import timezone
+from os import getenv
+import atexit
+import threading
+import time
+
 
 class SessionDBAuth(SessionExpAuth):
     """SessionDBAuth class inherits from SessionExpAuth class and implements
-    an authentication system, based on Session IDs stored in a database
+    an authentication system, based on Session IDs stored in a database:
+    the UserSession file, or the session store itself when SESSION_STORE
+    selects one shared between worker processes
     """
+    def __init__(self):
+        """Instantiate new SessionDBAuth class instance. Queued renewals
+        are also written by the sweeper once renew_flush_interval has
+        passed, and at exit
+        """
+        try:
+            self.renew_batch_size = int(getenv('SESSION_RENEW_BATCH'))
+        except Exception:
+            self.renew_batch_size = 100
+        try:
+            self.renew_flush_interval = float(getenv('SESSION_RENEW_FLUSH'))
+        except Exception:
+            self.renew_flush_interval = 5.0
+        self._pending_renewals = {}
+        self._renewals_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        super().__init__()
+        self.shared_store = getattr(self.user_id_by_session_id, 'shared',
+                                    False)
+        atexit.register(self.flush_renewals)
+
     def create_session(self, user_id: str = None) -> str:
         """Create a Session ID for a User ID
         """
         session_id = super().create_session(user_id)
         if not session_id:
             return None
+        if self.shared_store:
+            return session_id
 
         user_session = UserSession(user_id=user_id, session_id=session_id)
         user_session.save()
@@ -26,17 +58,37 @@ class SessionDBAuth(SessionExpAuth):
         """
         if session_id is None:
             return None
-        UserSession.load_from_file()
+        if self.shared_store:
+            return super().user_id_for_session_id(session_id)
+        UserSession.reload_if_changed()
+        if session_id not in self.user_id_by_session_id:
+            self._restore_session(session_id)
         uid = super().user_id_for_session_id(session_id)
         if uid is None:
             return None
-        if not UserSession.all():
+        if not UserSession.count():
             return None
         sessions = UserSession.search({'session_id': session_id})
         if sessions:
             session = sessions[0]
             return session.user_id
 
+    def _restore_session(self, session_id: str) -> None:
+        """Load a session missing from memory, created by another worker
+        or before a restart, from its UserSession, keeping the last use
+        written by flush_renewals
+        """
+        sessions = UserSession.search({'session_id': session_id})
+        if not sessions:
+            return
+        user_session = sessions[0]
+        created_at = user_session.created_at.replace(tzinfo=timezone.utc)
+        session_record = SessionRecord(user_session.user_id,
+                                       int(created_at.timestamp()),
+                                       user_session.last_seen or 0)
+        self.user_id_by_session_id[session_id] = session_record
+        self._schedule_expiry(session_id, session_record)
+
     def destroy_session(self, request=None) -> bool:
         """Destroy a valid UserSession based on Session ID in request cookie
         """
@@ -45,6 +97,8 @@ class SessionDBAuth(SessionExpAuth):
         session_id = self.session_cookie(request)
         if session_id is None:
             return False
+        if self.shared_store:
+            return super().destroy_session(request)
         user_id = self.user_id_for_session_id(session_id)
         if user_id is None:
             return False
@@ -53,3 +107,55 @@ class SessionDBAuth(SessionExpAuth):
             sessions[0].remove()
             return True
         return False
+
+    def renew_session(self, session_id: str, session_record: SessionRecord,
+                      last_seen: int) -> None:
+        """Slide the idle expiry of a session and queue the renewal, writing
+        queued renewals to the UserSession store in batches
+        """
+        super().renew_session(session_id, session_record, last_seen)
+        if self.shared_store:
+            return
+        with self._renewals_lock:
+            self._pending_renewals[session_id] = last_seen
+            due = len(self._pending_renewals) >= self.renew_batch_size or\
+                time.monotonic() - self._last_flush >= \
+                self.renew_flush_interval
+        if due:
+            self.flush_renewals()
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """Start the sweeper thread, waking up at least every
+        renew_flush_interval seconds to write queued renewals
+        """
+        super().start_sweeper(min(interval, self.renew_flush_interval))
+
+    def _sweep(self) -> None:
+        """Evict expired sessions and write renewals queued for longer
+        than renew_flush_interval
+        """
+        super()._sweep()
+        with self._renewals_lock:
+            due = self._pending_renewals and time.monotonic() - \
+                self._last_flush >= self.renew_flush_interval
+        if due:
+            self.flush_renewals()
+
+    def flush_renewals(self) -> int:
+        """Save every queued renewal with a single write to the UserSession
+        store, recording the last use as last_seen, and return the number
+        of sessions saved
+        """
+        with self._renewals_lock:
+            pending, self._pending_renewals = self._pending_renewals, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        user_sessions = []
+        for session_id, last_seen in pending.items():
+            sessions = UserSession.search({'session_id': session_id})
+            if sessions:
+                sessions[0].last_seen = last_seen
+                user_sessions.append(sessions[0])
+        UserSession.save_all(user_sessions)
+        return len(user_sessions)
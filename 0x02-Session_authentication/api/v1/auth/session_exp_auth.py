@@ -3,10 +3,14 @@
 SessionExpAuth class module for the API
 """
 from api.v1.auth.session_auth import SessionAuth
+from api.v1.auth.session_store import SessionRecord
 from models.user import User
 
-from datetime import datetime, timedelta
 from os import getenv
+from typing import Dict, Optional
+import heapq
+import threading
+import time
 
 
 class SessionExpAuth(SessionAuth):
@@ -16,10 +20,32 @@ class SessionExpAuth(SessionAuth):
     def __init__(self):
         """Instantiate new SessionExpAuth class instance
         """
+        super().__init__()
         try:
             self.session_duration = int(getenv('SESSION_DURATION'))
         except Exception:
             self.session_duration = 0
+        try:
+            self.idle_timeout = int(getenv('SESSION_IDLE_TIMEOUT'))
+        except Exception:
+            self.idle_timeout = 0
+        try:
+            self.renew_threshold = int(getenv('SESSION_RENEW_THRESHOLD'))
+        except Exception:
+            self.renew_threshold = self.idle_timeout // 2
+        self._expiry_heap = []
+        self._expiry_lock = threading.Lock()
+        self._evicted = 0
+        self._stale = 0
+        self._sweeper = None
+        self._sweeper_stop = threading.Event()
+        try:
+            self.sweep_interval = float(getenv('SESSION_SWEEP_INTERVAL'))
+        except Exception:
+            self.sweep_interval = 60.0
+        if self.sweep_interval > 0 and \
+                (self.session_duration > 0 or self.idle_timeout > 0):
+            self.start_sweeper(self.sweep_interval)
 
     def create_session(self, user_id: str = None) -> str:
         """Create a Session ID for a User ID
@@ -28,11 +54,10 @@ class SessionExpAuth(SessionAuth):
         if not session_id:
             return None
 
-        session_dictionary = {}
-        session_dictionary['user_id'] = user_id
-        session_dictionary['created_at'] = datetime.now()
-        self.user_id_by_session_id[session_id] = session_dictionary
+        session_record = SessionRecord(user_id, int(time.time()))
+        self.user_id_by_session_id[session_id] = session_record
 
+        self._schedule_expiry(session_id, session_record)
         return session_id
 
     def user_id_for_session_id(self, session_id: str = None) -> str:
@@ -40,20 +65,177 @@ class SessionExpAuth(SessionAuth):
         """
         if session_id is None:
             return None
-        if not self.user_id_by_session_id.get(session_id):
+        session_record = self.user_id_by_session_id.get(session_id)
+        if not isinstance(session_record, SessionRecord):
             return None
+        user_id = session_record.user_id
+        created_at = session_record.created_at
 
-        session_dictionary = self.user_id_by_session_id[session_id]
-        user_id = session_dictionary.get('user_id')
-        created_at = session_dictionary.get('created_at')
-
-        if self.session_duration <= 0:
+        if self.session_duration <= 0 and self.idle_timeout <= 0:
             return user_id
         if not created_at:
             return None
 
-        current_datetime = datetime.now()
-        expiry = created_at + timedelta(seconds=self.session_duration)
-        if expiry < current_datetime:
-            return None
+        now = time.time()
+        if self.session_duration > 0:
+            if created_at + self.session_duration < now:
+                self._evict_stale(session_id, created_at)
+                return None
+        if self.idle_timeout > 0:
+            last_seen = session_record.last_seen or created_at
+            idle_expiry = last_seen + self.idle_timeout
+            if idle_expiry < now:
+                self._evict_stale(session_id, created_at)
+                return None
+            if idle_expiry - now < self.renew_threshold:
+                self.renew_session(session_id, session_record, int(now))
         return user_id
+
+    def renew_session(self, session_id: str, session_record: SessionRecord,
+                      last_seen: int) -> None:
+        """Slide the idle expiry of a session by recording its last use.
+        Only called once the remaining idle time falls under
+        renew_threshold, so an active session is written rarely
+        """
+        session_record.last_seen = last_seen
+        self.user_id_by_session_id[session_id] = session_record
+        with self._expiry_lock:
+            self._stale += 1
+        self._schedule_expiry(session_id, session_record)
+
+    def destroy_session(self, request=None) -> bool:
+        """Destroy the session of a request, leaving its expiry entry to
+        be discarded by the sweeper or the next heap compaction
+        """
+        if not super().destroy_session(request):
+            return False
+        with self._expiry_lock:
+            self._stale += 1
+        return True
+
+    def sweep_expired(self, now: float = None) -> int:
+        """Evict every session whose expiry time has passed and return how
+        many were evicted. Only expired heap entries are visited
+        """
+        if now is None:
+            now = time.time()
+        evicted = 0
+        while True:
+            with self._expiry_lock:
+                if not self._expiry_heap or self._expiry_heap[0][0] > now:
+                    break
+                expiry, session_id = heapq.heappop(self._expiry_heap)
+            session = self.user_id_by_session_id.get(session_id)
+            current_expiry = self._expiry_of(session)
+            if current_expiry != expiry:
+                with self._expiry_lock:
+                    self._stale = max(self._stale - 1, 0)
+            if current_expiry is None or current_expiry > now:
+                continue
+            if self._evict(session_id, session.created_at):
+                evicted += 1
+        return evicted
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """Start a daemon thread calling sweep_expired every interval seconds
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+
+        def sweep():
+            while not self._sweeper_stop.wait(interval):
+                self._sweep()
+
+        self._sweeper = threading.Thread(target=sweep, daemon=True,
+                                         name="session-sweeper")
+        self._sweeper.start()
+
+    def stop_sweeper(self, timeout: float = None) -> None:
+        """Stop the background sweeper thread
+        """
+        if self._sweeper is None:
+            return
+        self._sweeper_stop.set()
+        self._sweeper.join(timeout)
+        self._sweeper = None
+
+    def session_metrics(self) -> Dict[str, int]:
+        """Return the number of live sessions, of entries in the expiry
+        queue, of those entries that are stale and of sessions evicted
+        so far
+        """
+        with self._expiry_lock:
+            scheduled = len(self._expiry_heap)
+            stale = self._stale
+        return {
+            'live': len(self.user_id_by_session_id),
+            'scheduled': scheduled,
+            'stale': stale,
+            'evicted': self._evicted,
+        }
+
+    def _sweep(self) -> None:
+        """Periodic work of the sweeper thread
+        """
+        self.sweep_expired()
+
+    def _expiry_of(self, session) -> Optional[int]:
+        """Return the epoch time a session expires at, or None if it
+        never expires
+        """
+        if not isinstance(session, SessionRecord) or not session.created_at:
+            return None
+        expiries = []
+        if self.session_duration > 0:
+            expiries.append(session.created_at + self.session_duration)
+        if self.idle_timeout > 0:
+            last_seen = session.last_seen or session.created_at
+            expiries.append(last_seen + self.idle_timeout)
+        return min(expiries) if expiries else None
+
+    def _schedule_expiry(self, session_id: str,
+                         session: SessionRecord) -> None:
+        """Queue a session for the sweeper at its current expiry time
+        """
+        expiry = self._expiry_of(session)
+        if expiry is None:
+            return
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expiry, session_id))
+            if self._stale > len(self._expiry_heap) - self._stale:
+                self._compact_expiry_heap()
+
+    def _compact_expiry_heap(self) -> None:
+        """Drop the entries of destroyed, evicted or renewed sessions from
+        the expiry queue. Called with _expiry_lock held
+        """
+        self._expiry_heap = [
+            (expiry, session_id) for expiry, session_id in self._expiry_heap
+            if self._expiry_of(self.user_id_by_session_id.get(session_id))
+            == expiry]
+        heapq.heapify(self._expiry_heap)
+        self._stale = 0
+
+    def _evict(self, session_id: str, created_at: int) -> bool:
+        """Remove an expired session unless it was replaced meanwhile
+        """
+        session = self.user_id_by_session_id.get(session_id)
+        if not isinstance(session, SessionRecord)\
+                or session.created_at != created_at:
+            return False
+        try:
+            del self.user_id_by_session_id[session_id]
+        except KeyError:
+            return False
+        with self._expiry_lock:
+            self._evicted += 1
+        return True
+
+    def _evict_stale(self, session_id: str, created_at: int) -> None:
+        """Evict an expired session found outside the sweeper, whose
+        expiry entry stays queued
+        """
+        if self._evict(session_id, created_at):
+            with self._expiry_lock:
+                self._stale += 1
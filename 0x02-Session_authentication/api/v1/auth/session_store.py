@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Session store backends for the SessionAuth family
+"""
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import datetime
+from os import getenv
+from typing import Iterator, Union
+import fcntl
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import uuid
+import zlib
+
+
+class SessionRecord:
+    """SessionRecord holds the User ID and epoch-second timestamps of an
+    expiring session in slots instead of a per-session dictionary
+    """
+    __slots__ = ('user_id', 'created_at', 'last_seen')
+
+    def __init__(self, user_id: str, created_at: int, last_seen: int = 0):
+        """Instantiate new SessionRecord class instance
+        """
+        self.user_id = user_id
+        self.created_at = created_at
+        self.last_seen = last_seen
+
+    def __eq__(self, other) -> bool:
+        """Equality
+        """
+        if not isinstance(other, SessionRecord):
+            return False
+        return (self.user_id, self.created_at, self.last_seen) ==\
+            (other.user_id, other.created_at, other.last_seen)
+
+    def __repr__(self) -> str:
+        """Representation
+        """
+        return "SessionRecord({!r}, {}, {})".format(
+            self.user_id, self.created_at, self.last_seen)
+
+
+def encode_session(value) -> str:
+    """Serialize a session value (a User ID or a SessionRecord)
+    """
+    if isinstance(value, SessionRecord):
+        value = {'user_id': value.user_id, 'created_at': value.created_at,
+                 'last_seen': value.last_seen}
+    return json.dumps(value)
+
+
+def decode_session(raw: str):
+    """Deserialize a session value written by encode_session
+    """
+    value = json.loads(raw)
+    if not isinstance(value, dict):
+        return value
+    timestamps = []
+    for key in ('created_at', 'last_seen'):
+        timestamp = value.get(key) or 0
+        if isinstance(timestamp, str):
+            timestamp = int(datetime.fromisoformat(timestamp).timestamp())
+        timestamps.append(timestamp)
+    return SessionRecord(value.get('user_id'), *timestamps)
+
+
+class SessionStore(MutableMapping):
+    """SessionStore is the mapping interface of session backends:
+    Session ID -> User ID or SessionRecord. Stores that are shared
+    between worker processes set shared
+    """
+    shared = False
+
+    def close(self) -> None:
+        """Release the resources held by the store
+        """
+
+
+class MemorySessionStore(dict, SessionStore):
+    """MemorySessionStore keeps sessions in a dictionary local to the
+    process
+    """
+
+
+class CompactSessionStore(SessionStore):
+    """CompactSessionStore keeps sessions in a process-local dictionary
+    keyed by the 16-byte binary form of the UUID Session IDs
+    """
+    def __init__(self):
+        """Instantiate new CompactSessionStore class instance
+        """
+        self._sessions = {}
+
+    @staticmethod
+    def _key(session_id: str) -> Union[bytes, str]:
+        """Return the binary key of a UUID Session ID, or the ID itself
+        if it is not a UUID
+        """
+        try:
+            return uuid.UUID(session_id).bytes
+        except (ValueError, TypeError, AttributeError):
+            return session_id
+
+    def __getitem__(self, session_id: str):
+        """Return the session value of a Session ID
+        """
+        return self._sessions[self._key(session_id)]
+
+    def __setitem__(self, session_id: str, value) -> None:
+        """Store the session value of a Session ID
+        """
+        self._sessions[self._key(session_id)] = value
+
+    def __delitem__(self, session_id: str) -> None:
+        """Delete the session of a Session ID
+        """
+        del self._sessions[self._key(session_id)]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the stored Session IDs
+        """
+        for key in list(self._sessions):
+            yield str(uuid.UUID(bytes=key)) if type(key) is bytes else key
+
+    def __len__(self) -> int:
+        """Return the number of stored sessions
+        """
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLiteSessionStore keeps sessions in a SQLite database in WAL mode,
+    so several worker processes can read it while one writes
+    """
+    shared = True
+
+    def __init__(self, db_path: str = ".db_sessions.sqlite"):
+        """Instantiate new SQLiteSessionStore class instance
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(session_id TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the current thread
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __getitem__(self, session_id: str):
+        """Return the session value of a Session ID
+        """
+        row = self._connection().execute(
+            "SELECT value FROM sessions WHERE session_id = ?",
+            (session_id,)).fetchone()
+        if row is None:
+            raise KeyError(session_id)
+        return decode_session(row[0])
+
+    def __setitem__(self, session_id: str, value) -> None:
+        """Store the session value of a Session ID
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, value) "
+            "VALUES (?, ?)", (session_id, encode_session(value)))
+
+    def __delitem__(self, session_id: str) -> None:
+        """Delete the session of a Session ID
+        """
+        cursor = self._connection().execute(
+            "DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(session_id)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the stored Session IDs
+        """
+        rows = self._connection().execute(
+            "SELECT session_id FROM sessions").fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        """Return the number of stored sessions
+        """
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the connection of the current thread
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class MmapSessionStore(SessionStore):
+    """MmapSessionStore keeps sessions in an open-addressing hash table
+    inside a memory-mapped file shared by every worker process. Lookups
+    read only the probed slots; writes take an exclusive file lock. The
+    table is rebuilt, dropping deleted slots, and doubled when needed once
+    more than MAX_LOAD of its slots are in use or deleted
+    """
+    MAGIC = b'SES2'
+    HEADER = struct.Struct('<4sIII')
+    SLOT = struct.Struct('<BB64sH128s')
+    EMPTY, USED, DELETED = 0, 1, 2
+    MAX_LOAD = 0.75
+    shared = True
+
+    def __init__(self, file_path: str = ".db_sessions.mmap",
+                 capacity: int = 65536):
+        """Instantiate new MmapSessionStore class instance, creating a
+        table of capacity slots if the file does not exist yet
+        """
+        self.file_path = file_path
+        self._lock = threading.RLock()
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self._file_size(capacity))
+                os.pwrite(self._fd,
+                          self.HEADER.pack(self.MAGIC, capacity, 0, 0), 0)
+            self._mm = mmap.mmap(self._fd, 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        magic, self.capacity, _, _ = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError("{} is not a session store".format(file_path))
+
+    def _file_size(self, capacity: int) -> int:
+        """Return the size in bytes of a table of capacity slots
+        """
+        return self.HEADER.size + capacity * self.SLOT.size
+
+    @contextmanager
+    def _locked(self, operation: int):
+        """Hold the thread lock and the file lock for a block, remapping
+        the file first if another process resized the table
+        """
+        with self._lock:
+            fcntl.flock(self._fd, operation)
+            try:
+                capacity = self.HEADER.unpack_from(self._mm, 0)[1]
+                if capacity != self.capacity:
+                    self._mm.close()
+                    self._mm = mmap.mmap(self._fd, 0)
+                    self.capacity = capacity
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        """Return the byte offset of a slot
+        """
+        return self.HEADER.size + index * self.SLOT.size
+
+    @staticmethod
+    def _key(session_id: str) -> bytes:
+        """Return the stored form of a Session ID, raising KeyError for
+        anything but a string
+        """
+        if not isinstance(session_id, str):
+            raise KeyError(session_id)
+        return session_id.encode()
+
+    def _probe(self, key: bytes):
+        """Yield (index, state, key, value) for the slots probed for key
+        """
+        start = zlib.crc32(key) % self.capacity
+        for i in range(self.capacity):
+            index = (start + i) % self.capacity
+            state, key_len, slot_key, value_len, value = \
+                self.SLOT.unpack_from(self._mm, self._offset(index))
+            yield index, state, slot_key[:key_len], value[:value_len]
+            if state == self.EMPTY:
+                return
+
+    def _find(self, key: bytes):
+        """Return (index, value) of the slot holding key, or (None, None)
+        """
+        for index, state, slot_key, value in self._probe(key):
+            if state == self.USED and slot_key == key:
+                return index, value
+        return None, None
+
+    def _counts(self):
+        """Return the number of used and of deleted slots
+        """
+        return self.HEADER.unpack_from(self._mm, 0)[2:]
+
+    def _set_counts(self, used: int, deleted: int) -> None:
+        """Record the number of used and of deleted slots in the header
+        """
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.capacity,
+                              used, deleted)
+
+    def _entries(self):
+        """Return the (key, value) pairs of every used slot
+        """
+        entries = []
+        for index in range(self.capacity):
+            state, key_len, key, value_len, value = \
+                self.SLOT.unpack_from(self._mm, self._offset(index))
+            if state == self.USED:
+                entries.append((key[:key_len], value[:value_len]))
+        return entries
+
+    def _rebuild(self, capacity: int) -> None:
+        """Reinsert every session into an emptied table of capacity slots,
+        dropping deleted slots. Called with the exclusive lock held
+        """
+        entries = self._entries()
+        if capacity != self.capacity:
+            self._mm.close()
+            os.ftruncate(self._fd, self._file_size(capacity))
+            self._mm = mmap.mmap(self._fd, 0)
+            self.capacity = capacity
+        self._mm[self.HEADER.size:] = bytes(capacity * self.SLOT.size)
+        for key, raw in entries:
+            # with no deleted slots the last probed slot is the free one
+            for index, _, _, _ in self._probe(key):
+                pass
+            self.SLOT.pack_into(self._mm, self._offset(index), self.USED,
+                                len(key), key, len(raw), raw)
+        self._set_counts(len(entries), 0)
+
+    def __getitem__(self, session_id: str):
+        """Return the session value of a Session ID
+        """
+        key = self._key(session_id)
+        with self._locked(fcntl.LOCK_SH):
+            _, value = self._find(key)
+        if value is None:
+            raise KeyError(session_id)
+        return decode_session(value.decode())
+
+    def __setitem__(self, session_id: str, value) -> None:
+        """Store the session value of a Session ID
+        """
+        key = self._key(session_id)
+        raw = encode_session(value).encode()
+        if len(key) > 64 or len(raw) > 128:
+            raise ValueError("session too large for MmapSessionStore")
+        with self._locked(fcntl.LOCK_EX):
+            index, _ = self._find(key)
+            if index is None:
+                used, deleted = self._counts()
+                if used + deleted + 1 > self.capacity * self.MAX_LOAD:
+                    capacity = self.capacity
+                    while used + 1 > capacity * self.MAX_LOAD / 2:
+                        capacity *= 2
+                    self._rebuild(capacity)
+                    used, deleted = self._counts()
+                for index, state, _, _ in self._probe(key):
+                    if state != self.USED:
+                        break
+                if state == self.DELETED:
+                    deleted -= 1
+                self._set_counts(used + 1, deleted)
+            self.SLOT.pack_into(self._mm, self._offset(index), self.USED,
+                                len(key), key, len(raw), raw)
+
+    def __delitem__(self, session_id: str) -> None:
+        """Delete the session of a Session ID
+        """
+        key = self._key(session_id)
+        with self._locked(fcntl.LOCK_EX):
+            index, _ = self._find(key)
+            if index is None:
+                raise KeyError(session_id)
+            self.SLOT.pack_into(self._mm, self._offset(index), self.DELETED,
+                                0, b'', 0, b'')
+            used, deleted = self._counts()
+            self._set_counts(used - 1, deleted + 1)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the stored Session IDs
+        """
+        with self._locked(fcntl.LOCK_SH):
+            keys = [key.decode() for key, _ in self._entries()]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        """Return the number of stored sessions
+        """
+        with self._locked(fcntl.LOCK_SH):
+            return self._counts()[0]
+
+    def close(self) -> None:
+        """Unmap and close the store file
+        """
+        self._mm.close()
+        os.close(self._fd)
+
+
+def get_session_store(store_type: str = None) -> SessionStore:
+    """Return the session store selected by SESSION_STORE (memory,
+    compact, sqlite or mmap), located at SESSION_STORE_PATH for shared
+    backends; a new mmap table starts with SESSION_STORE_CAPACITY slots
+    """
+    store_type = store_type or getenv("SESSION_STORE", "memory")
+    store_path = getenv("SESSION_STORE_PATH")
+    if store_type == "sqlite":
+        return SQLiteSessionStore(store_path or ".db_sessions.sqlite")
+    if store_type == "mmap":
+        capacity = int(getenv("SESSION_STORE_CAPACITY", 65536))
+        return MmapSessionStore(store_path or ".db_sessions.mmap", capacity)
+    if store_type == "compact":
+        return CompactSessionStore()
+    return MemorySessionStore()
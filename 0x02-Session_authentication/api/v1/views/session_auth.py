@@ -36,11 +36,12 @@ def login_user() -> str:
     if error_msg is None:
         email = request.form.get('email')
         password = request.form.get('password')
-        user_list = User.search({'email': email})
+        user_list = User.find_all_by_email(email)
 
         if user_list:
-            user = user_list[0]
-            if not user.is_valid_password(password):
+            user = next((user for user in user_list
+                         if user.is_valid_password(password)), None)
+            if user is None:
                 error_msg = "wrong password"
                 return jsonify({'error': error_msg}), 401
             else:
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+""" Benchmark: BasicAuth credential check from 100 to 1M users
+"""
+import sys
+import time
+from api.v1.auth.basic_auth import BasicAuth
+from models.user import User
+
+User.save_to_file = classmethod(lambda cls: None)
+sizes = [int(arg) for arg in sys.argv[1:]] or [100, 10000, 1000000]
+auth = BasicAuth()
+
+for size in sizes:
+    User.load_from_file()
+    for i in range(size):
+        User(email="user{}@hbtn.io".format(i)).save()
+    user = User(email="Bob@hbtn.io")
+    user.password = "H0lberton:School:98!"
+    user.save()
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        found = auth.user_object_from_credentials("bob@hbtn.io",
+                                                  "H0lberton:School:98!")
+    elapsed = (time.perf_counter() - start) / 1000
+    assert found is user
+    print("{:>8} users: {:.2f} us/login".format(size, elapsed * 1e6))
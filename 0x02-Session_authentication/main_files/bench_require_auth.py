@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+""" Benchmark: Auth.require_auth with a list vs an ExcludedPathMatcher
+"""
+import time
+from api.v1.auth.auth import Auth, ExcludedPathMatcher
+
+auth = Auth()
+paths = ['/api/v1/status', '/api/v1/users', '/api/v1/users/me',
+         '/api/v1/stats/', '/api/v1/forbidden']
+
+for size in (10, 1000):
+    excluded_paths = ['/api/v1/excluded{}/'.format(i) for i in range(size)]
+    excluded_paths += ['/api/v1/static{}/*'.format(i) for i in range(size)]
+    excluded_paths.append('/api/v1/status/')
+    matcher = ExcludedPathMatcher(excluded_paths)
+
+    for name, excluded in (("list", excluded_paths), ("matcher", matcher)):
+        start = time.perf_counter()
+        for _ in range(10000):
+            for path in paths:
+                auth.require_auth(path, excluded)
+        elapsed = time.perf_counter() - start
+        print("{:>4} patterns, {:>7}: {:.2f} us/call".format(
+              size, name, elapsed / (10000 * len(paths)) * 1e6))
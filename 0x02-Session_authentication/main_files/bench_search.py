@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+""" Benchmark: indexed User.search against a linear scan
+"""
+import sys
+import time
+from models.base import DATA
+from models.user import User
+
+User.save_to_file = classmethod(lambda cls: None)
+sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 1000000]
+
+for size in sizes:
+    User.load_from_file()
+    for i in range(size):
+        user = User(email="user{}@hbtn.io".format(i))
+        user.save()
+    email = "user{}@hbtn.io".format(size // 2)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        found = User.search({'email': email})
+    indexed = (time.perf_counter() - start) / 100
+
+    start = time.perf_counter()
+    linear = [u for u in DATA['User'].values() if u.email == email]
+    scan = time.perf_counter() - start
+
+    assert found == linear
+    print("{:>8} users: indexed {:.6f}s, linear scan {:.6f}s".format(
+          size, indexed, scan))
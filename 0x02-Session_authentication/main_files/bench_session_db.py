@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+""" Benchmark: SessionDBAuth lookups per second against stored sessions
+"""
+import os
+import sys
+import tempfile
+import time
+from api.v1.auth.session_db_auth import SessionDBAuth
+from models.base import DATA
+from models.user_session import UserSession
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+requests = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+# keep the fake sessions out of the real .db_UserSession.json
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+
+UserSession.load_from_file()
+for i in range(size):
+    user_session = UserSession(user_id=str(i), session_id="s{}".format(i))
+    DATA['UserSession'][user_session.id] = user_session
+UserSession.save_to_file()
+
+auth = SessionDBAuth()
+session_id = auth.create_session("bench-user")
+
+for name, reload in (("reload every request", UserSession.load_from_file),
+                     ("reload if changed", UserSession.reload_if_changed)):
+    count = requests if reload is UserSession.reload_if_changed else 10
+    start = time.perf_counter()
+    for _ in range(count):
+        reload()
+        assert UserSession.search({'session_id': session_id})
+    elapsed = time.perf_counter() - start
+    print("{} sessions, {}: {:.1f} requests/s".format(
+          size, name, count / elapsed))
+
+start = time.perf_counter()
+for _ in range(requests):
+    assert auth.user_id_for_session_id(session_id) == "bench-user"
+elapsed = time.perf_counter() - start
+print("{} sessions, SessionDBAuth.user_id_for_session_id: "
+      "{:.1f} requests/s".format(size, requests / elapsed))
+
+workdir.cleanup()
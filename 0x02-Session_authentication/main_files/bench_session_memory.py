@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+""" Benchmark: memory of SessionExpAuth sessions, dict layout vs compact
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+from api.v1.auth.session_store import CompactSessionStore, SessionRecord
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+user_id = str(uuid4())
+
+
+def dict_layout():
+    sessions = {}
+    for _ in range(count):
+        session_id = str(uuid4())
+        sessions[session_id] = {'user_id': user_id,
+                                'created_at': datetime.now()}
+    return sessions, session_id
+
+
+def compact_layout():
+    sessions = CompactSessionStore()
+    for _ in range(count):
+        session_id = str(uuid4())
+        sessions[session_id] = SessionRecord(user_id, int(time.time()))
+    return sessions, session_id
+
+
+for name, layout in (("dict + str keys", dict_layout),
+                     ("SessionRecord + 16-byte keys", compact_layout)):
+    tracemalloc.start()
+    sessions, session_id = layout()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert sessions[session_id]
+    print("{} sessions, {}: {:.1f} MiB ({:.0f} bytes/session)".format(
+          count, name, current / 2 ** 20, current / count))
+    del sessions
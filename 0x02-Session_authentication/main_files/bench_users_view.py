@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+""" Benchmark: latency and memory of GET /api/v1/users at 100k users
+"""
+import sys
+import time
+import tracemalloc
+from api.v1.app import app
+from models.user import User
+
+User.save_to_file = classmethod(lambda cls: None)
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+User.load_from_file()
+for i in range(count):
+    User(email="user{}@hbtn.io".format(i), first_name="User{}".format(i)).save()
+
+client = app.test_client()
+for name, url in (("full list", "/api/v1/users"),
+                  ("page of 100", "/api/v1/users?limit=100"),
+                  ("ndjson stream", "/api/v1/users?format=ndjson")):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    first_chunk = time.perf_counter() - start
+    size = sum(len(chunk) for chunk in response.response)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{} users, {:>13}: first byte {:.3f}s, total {:.3f}s, "
+          "{:.1f} MiB body, peak {:.1f} MiB".format(
+              count, name, first_chunk, total, size / 2 ** 20, peak / 2 ** 20))
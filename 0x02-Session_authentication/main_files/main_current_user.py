@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+""" Main: current_user is evaluated once per request
+"""
+import base64
+import os
+
+os.environ['AUTH_TYPE'] = 'basic_auth'
+
+from api.v1.app import app, auth
+from models.user import User
+
+user = User()
+user.email = "bob_once@hbtn.io"
+user.password = "H0lberton:School:98!"
+user.save()
+
+lookups = 0
+current_user = auth.current_user
+
+
+def counting_current_user(request=None):
+    global lookups
+    lookups += 1
+    return current_user(request)
+
+
+auth.current_user = counting_current_user
+credentials = base64.b64encode(b"bob_once@hbtn.io:H0lberton:School:98!")
+headers = {'Authorization': 'Basic ' + credentials.decode()}
+
+with app.test_client() as client:
+    for _ in range(3):
+        response = client.get('/api/v1/users/{}'.format(user.id),
+                              headers=headers)
+        print(response.status_code, lookups)
+user.remove()
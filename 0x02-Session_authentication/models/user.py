@@ -2,12 +2,14 @@
 """ User module
 """
 import hashlib
-from models.base import Base
+from models.base import Base, DATA, INDEXES
+from typing import List, TypeVar
 
 
 class User(Base):
     """ User class
     """
+    indexed_attributes = ('email',)
 
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a User instance
@@ -18,6 +20,34 @@ class User(Base):
         self.first_name = kwargs.get('first_name')
         self.last_name = kwargs.get('last_name')
 
+    @classmethod
+    def index_key(cls, name: str, value):
+        """ Index emails case-insensitively
+        """
+        if name == 'email' and isinstance(value, str):
+            return value.lower()
+        return value
+
+    @classmethod
+    def find_by_email(cls, email: str) -> TypeVar('User'):
+        """ Return the User with an email, compared case-insensitively and
+        preferring an exact match, or None
+        """
+        users = cls.find_all_by_email(email)
+        return users[0] if users else None
+
+    @classmethod
+    def find_all_by_email(cls, email: str) -> List[TypeVar('User')]:
+        """ Return every User with an email, compared case-insensitively,
+        exact matches first
+        """
+        if email is None or type(email) is not str:
+            return []
+        ids = INDEXES.get(cls.__name__, {}).get('email', {})\
+            .get(cls.index_key('email', email), {})
+        users = [DATA[cls.__name__][user_id] for user_id in ids]
+        return sorted(users, key=lambda user: user.email != email)
+
     @property
     def password(self) -> str:
         """ Getter of the password
@@ -8,9 +8,12 @@ from models.base import Base
 class UserSession(Base):
     """ UserSession class
     """
+    indexed_attributes = ('session_id',)
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a UserSession instance
         """
         super().__init__(*args, **kwargs)
         self.user_id = kwargs.get('user_id')
         self.session_id = kwargs.get('session_id')
+        self.last_seen = kwargs.get('last_seen', 0)
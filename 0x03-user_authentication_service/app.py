@@ -3,6 +3,8 @@
 """
 from auth import Auth
 from flask import abort, Flask, jsonify, redirect, request
+from hashing import HashingBusy
+from os import getenv
 
 
 app = Flask(__name__)
@@ -147,6 +149,33 @@ def update_password() -> str:
                        }), 200
 
 
+@app.route('/metrics', methods=['GET'], strict_slashes=False)
+def metrics() -> str:
+    """ GET '/metrics', only served when METRICS_ENABLED is 1
+    Return:
+      - JSON object with password hashing queue depth and counters
+    """
+    if getenv('METRICS_ENABLED', '0') != '1':
+        abort(404)
+    return jsonify({"hashing": AUTH.hashing_metrics()}), 200
+
+
+@app.teardown_appcontext
+def release_db_session(exception=None) -> None:
+    """ Release the database session used by the request
+    """
+    AUTH.release_db_session()
+
+
+@app.errorhandler(HashingBusy)
+def hashing_busy(error) -> str:
+    """ Handle a full password hashing queue
+    """
+    response = jsonify({"error": "Service busy, retry later"})
+    response.headers['Retry-After'] = "1"
+    return response, 503
+
+
 @app.errorhandler(404)
 def not_found(error) -> str:
     """ Handle 404 error
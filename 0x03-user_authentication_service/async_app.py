@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+""" Quart app module, the asyncio counterpart of app
+"""
+from async_auth import AsyncAuth
+from hashing import HashingBusy
+from os import getenv
+from quart import abort, Quart, jsonify, redirect, request
+
+
+app = Quart(__name__)
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+AUTH = AsyncAuth()
+
+
+@app.before_serving
+async def startup() -> None:
+    """ Create the database schema before accepting requests
+    """
+    await AUTH.start()
+
+
+@app.after_serving
+async def shutdown() -> None:
+    """ Release database connections
+    """
+    await AUTH.close()
+
+
+@app.route('/', methods=['GET'], strict_slashes=False)
+async def index() -> str:
+    """ GET '/'
+    Return:
+      - JSON string
+    """
+    return jsonify({"message": "Bienvenue"}), 200
+
+
+@app.route('/profile', methods=['GET'], strict_slashes=False)
+async def profile() -> str:
+    """ GET '/profile'
+    Request body:
+      - session_id
+    Return:
+      - User JSON object with email field
+    """
+    session_cookie = request.cookies.get('session_id')
+    user = await AUTH.get_user_from_session_id(session_cookie)
+    if session_cookie is None or user is None:
+        abort(403, description="Invalid user")
+    return jsonify({"email": user.email})
+
+
+@app.route('/users', methods=['POST'], strict_slashes=False)
+async def register() -> str:
+    """ POST '/users'
+    JSON body:
+      - email
+      - password
+    Return:
+      - User JSON object with email and status message
+    """
+    form = await request.form
+    email = form.get('email')
+    password = form.get('password')
+
+    try:
+        user = await AUTH.register_user(email, password)
+        return jsonify({
+                        "email": user.email,
+                        "message": "user created"
+                       }), 200
+    except ValueError:
+        return jsonify({"message": "email already registered"}), 400
+
+
+@app.route('/sessions', methods=['POST'], strict_slashes=False)
+async def login() -> str:
+    """ POST '/sessions'
+    JSON body:
+      - email
+      - password
+    Return:
+      - User JSON object with email and login status
+    """
+    form = await request.form
+    email = form.get('email', '')
+    password = form.get('password', '')
+    if not email or not password:
+        abort(401, description="Invalid request form data")
+
+    if await AUTH.valid_login(email, password):
+        session_id = await AUTH.create_session(email)
+        response = jsonify({
+                            "email": email,
+                            "message": "logged in"
+                           })
+        response.set_cookie("session_id", session_id)
+        return response, 200
+    else:
+        abort(401, description="Invalid username or password")
+
+
+@app.route('/sessions', methods=['DELETE'], strict_slashes=False)
+async def logout() -> None:
+    """ DELETE '/sessions'
+    Request body:
+      - session_id
+    """
+    session_cookie = request.cookies.get('session_id', None)
+    user = await AUTH.get_user_from_session_id(session_cookie)
+    if session_cookie is None or user is None:
+        abort(403, description="Invalid user")
+    else:
+        await AUTH.destroy_session(user.id)
+        return redirect('/', 302)
+
+
+@app.route('/reset_password', methods=['POST'], strict_slashes=False)
+async def get_reset_token() -> str:
+    """ POST '/reset_password'
+    Request body:
+      - email
+    Return:
+      - User JSON object with email and reset_token fields
+    """
+    form = await request.form
+    email = form.get('email', '')
+    if not email:
+        abort(401, description="Invalid credentials")
+
+    try:
+        reset_token = await AUTH.get_reset_password_token(email)
+    except ValueError:
+        abort(403, description="User not registered")
+    else:
+        return jsonify({
+                        "email": email,
+                        "reset_token": reset_token
+                       }), 200
+
+
+@app.route('/reset_password', methods=['PUT'], strict_slashes=False)
+async def update_password() -> str:
+    """ PUT '/reset_password'
+    Request body:
+      - email
+      - reset_token
+      - new_password
+    Return:
+      - User JSON object with email and status message
+    """
+    form = await request.form
+    email = form.get('email', '')
+    reset_token = form.get('reset_token', '')
+    new_password = form.get('new_password', '')
+    if not email or not reset_token or not new_password:
+        abort(401, description="Invalid request form data")
+
+    try:
+        await AUTH.update_password(reset_token, new_password)
+    except ValueError:
+        abort(403, description="User not registered")
+    else:
+        return jsonify({
+                        "email": email,
+                        "message": "Password updated"
+                       }), 200
+
+
+@app.route('/metrics', methods=['GET'], strict_slashes=False)
+async def metrics() -> str:
+    """ GET '/metrics', only served when METRICS_ENABLED is 1
+    Return:
+      - JSON object with password hashing queue depth and counters
+    """
+    if getenv('METRICS_ENABLED', '0') != '1':
+        abort(404)
+    return jsonify({"hashing": AUTH.hashing_metrics()}), 200
+
+
+@app.errorhandler(HashingBusy)
+async def hashing_busy(error) -> str:
+    """ Handle a full password hashing queue
+    """
+    response = jsonify({"error": "Service busy, retry later"})
+    response.headers['Retry-After'] = "1"
+    return response, 503
+
+
+@app.errorhandler(404)
+async def not_found(error) -> str:
+    """ Handle 404 error
+    """
+    return jsonify({"error": "Not found"}), 404
+
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5000)
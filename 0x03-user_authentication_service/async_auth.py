@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+""" Async Auth module
+"""
+from os import getenv
+from sqlalchemy.orm.exc import NoResultFound
+from typing import Dict, Union
+
+from async_db import AsyncDB
+from auth import _calibrate_rounds, _generate_uuid, _hash_rounds
+from hashing import get_hashing_executor
+from user import User
+
+
+class AsyncAuth:
+    """AsyncAuth class, the asyncio counterpart of Auth. Database calls
+    are awaited and bcrypt runs on the hashing executor without blocking
+    the event loop
+    """
+    def __init__(self):
+        """Initialize AsyncAuth class instance
+        """
+        self._hasher = get_hashing_executor()
+        self._db = AsyncDB()
+        target_ms = float(getenv('BCRYPT_TARGET_MS', 250))
+        self._rounds = _calibrate_rounds(target_ms)
+
+    async def start(self) -> None:
+        """Create the database schema
+        """
+        await self._db.init_schema()
+
+    async def close(self) -> None:
+        """Release the database connections
+        """
+        await self._db.dispose()
+
+    async def register_user(self, email: str, password: str) -> User:
+        """Register a new user
+        Args:
+            email (str): new user's email address
+            password (str): new user's password
+        Return:
+            (User): Newly created User class instance
+        """
+        try:
+            user = await self._db.find_user_by(email=email)
+        except NoResultFound:
+            hashed_password = await self._hash(password)
+            return await self._db.add_user(email, hashed_password)
+        else:
+            raise ValueError(f'User {email} already exists')
+
+    async def valid_login(self, email: str, password: str) -> bool:
+        """Validate user's login
+        Args:
+            email (str): returning user's email address
+            password (str): returning user's password
+        Return:
+            (bool): True if valid password for email else False
+        Hashes created with a lower work factor than the calibrated one are
+        upgraded on a successful login
+        """
+        try:
+            user = await self._db.find_user_by(email=email)
+        except NoResultFound:
+            return False
+        if not await self._hasher.check_password_async(password,
+                                                       user.hashed_password):
+            return False
+        if _hash_rounds(user.hashed_password) < self._rounds:
+            await self._db.update_user(
+                user.id, hashed_password=await self._hash(password))
+        return True
+
+    async def create_session(self, email: str) -> str:
+        """Create session for current user
+        Args:
+            email (str): returning user's email address
+        Return:
+            session_id (str): unique string associated with particular user
+        """
+        try:
+            user = await self._db.find_user_by(email=email)
+        except Exception:
+            return None
+        else:
+            session_id = _generate_uuid()
+            await self._db.update_user(user.id, session_id=session_id)
+            return session_id
+
+    async def get_user_from_session_id(self,
+                                       session_id: str) -> Union[User, None]:
+        """Fetch user using Session ID
+        Args:
+            session_id (str): unique string associated with particular user
+        Return:
+            (User) object with session_id attribute (SUCCESS) or None (FAIL)
+        """
+        if session_id is None:
+            return None
+        try:
+            return await self._db.find_user_by(session_id=session_id)
+        except Exception:
+            return None
+
+    async def destroy_session(self, user_id: int) -> None:
+        """Destroys user session
+        Args:
+            user_id (int): unique auto-generated database User ID
+        """
+        try:
+            await self._db.update_user(user_id, session_id=None)
+        except ValueError:
+            return None
+        return None
+
+    def hashing_metrics(self) -> Dict[str, int]:
+        """Report the load of the password hashing executor
+        Return:
+            (dict): queue depth and job counters of the executor
+        """
+        return self._hasher.metrics()
+
+    async def get_reset_password_token(self, email: str) -> str:
+        """Generate user reset password token
+        Args:
+            email (str): returning user's email address
+        Return:
+            reset_token (str): unique string for user to reset password
+        """
+        try:
+            user = await self._db.find_user_by(email=email)
+        except Exception:
+            raise ValueError
+        else:
+            reset_token = _generate_uuid()
+            await self._db.update_user(user.id, reset_token=reset_token)
+            return reset_token
+
+    async def update_password(self, reset_token: str, password: str) -> None:
+        """Update user password using reset token
+        Args:
+            reset_token (str): unique string for user to reset password
+            password (str): user password
+        """
+        try:
+            user = await self._db.find_user_by(reset_token=reset_token)
+        except Exception:
+            raise ValueError
+        else:
+            hashed_password = await self._hash(password)
+            await self._db.update_user(user.id,
+                                       hashed_password=hashed_password,
+                                       reset_token=None)
+
+    async def _hash(self, password: str) -> bytes:
+        """Hash a password with the calibrated work factor
+        """
+        return await self._hasher.hash_password_async(password, self._rounds)
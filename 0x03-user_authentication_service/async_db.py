@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Async DB module
+"""
+from os import getenv
+from sqlalchemy import event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import (AsyncEngine, async_sessionmaker,
+                                    create_async_engine)
+from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.pool import StaticPool
+
+from db import _set_sqlite_pragmas
+from user import Base, User
+
+
+class AsyncDB:
+    """AsyncDB class, the asyncio counterpart of DB. Every call runs in a
+    session of its own, so concurrent tasks never share one
+    """
+    def __init__(self, url: str = None) -> None:
+        """Initialize a new AsyncDB instance
+        Args:
+            url (str): async engine URL, defaults to ASYNC_DB_URL or
+                       sqlite+aiosqlite:///a.db
+        """
+        if url is None:
+            url = getenv('ASYNC_DB_URL', "sqlite+aiosqlite:///a.db")
+        self._engine = _create_async_engine(url)
+        if self._engine.dialect.name == 'sqlite':
+            event.listen(self._engine.sync_engine, 'connect',
+                         _set_sqlite_pragmas)
+        self._sessions = async_sessionmaker(self._engine,
+                                            expire_on_commit=False)
+
+    async def init_schema(self, reset: bool = None) -> None:
+        """Create the tables
+        Args:
+            reset (bool): drop existing tables first, defaults to True
+                          unless DB_RESET is 0
+        """
+        if reset is None:
+            reset = getenv('DB_RESET', '1') != '0'
+        async with self._engine.begin() as connection:
+            if reset:
+                await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def dispose(self) -> None:
+        """Close every pooled connection
+        """
+        await self._engine.dispose()
+
+    async def add_user(self, email: str, hashed_password: str) -> User:
+        """Create User instance object and save to database
+        Args:
+            email (str): user's email address
+            hashed_password (str): user's password hashed by bcrypt's hashpw
+        Return:
+            (User): Newly created User class instance
+        """
+        user = User(email=email, hashed_password=hashed_password)
+        async with self._sessions() as session:
+            session.add(user)
+            await session.commit()
+        return user
+
+    async def find_user_by(self, **kwargs) -> User:
+        """Search for user with attribute(s) matching keyword argument(s)
+        Args:
+            attributes (dict): a dictionary of attributes to match user
+        Return:
+            Matching user or raised error if user not found
+        """
+        async with self._sessions() as session:
+            return await _find_user_by(session, **kwargs)
+
+    async def update_user(self, user_id: int, **kwargs) -> None:
+        """Update found user's attributes
+        Args:
+            user_id (int): user's id
+            kwargs (dict): dictionary of key:value pairs representing the
+                           attributes to update and their corresponding values
+        Return:
+            None
+        """
+        async with self._sessions() as session:
+            try:
+                user = await _find_user_by(session, id=int(user_id))
+            except NoResultFound:
+                raise ValueError
+
+            for key, value in kwargs.items():
+                if hasattr(user, key):
+                    setattr(user, key, value)
+                else:
+                    raise ValueError
+            await session.commit()
+
+
+async def _find_user_by(session, **kwargs) -> User:
+    """Search for user within an open session
+    Args:
+        session (AsyncSession): session to query with
+        kwargs (dict): a dictionary of attributes to match user
+    Return:
+        Matching user or raised error if user not found
+    """
+    try:
+        statement = select(User).filter_by(**kwargs).limit(1)
+    except AttributeError:
+        raise InvalidRequestError
+    user = (await session.execute(statement)).scalars().first()
+    if user is None:
+        raise NoResultFound
+    return user
+
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    """Create an async engine with a connection pool suited to its database
+    Args:
+        url (str): async engine URL
+    Return:
+        Engine sharing one connection for in-memory SQLite, otherwise
+        pooling up to DB_POOL_SIZE connections plus DB_MAX_OVERFLOW
+    """
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and \
+            url.database in (None, '', ':memory:'):
+        return create_async_engine(url, echo=False, poolclass=StaticPool)
+    return create_async_engine(url, echo=False,
+                               pool_size=int(getenv('DB_POOL_SIZE', 5)),
+                               max_overflow=int(getenv('DB_MAX_OVERFLOW', 10)),
+                               pool_pre_ping=True)
@@ -2,11 +2,16 @@
 """ Auth module
 """
 import bcrypt
+import math
+import time
 import uuid
+from functools import lru_cache
+from os import getenv
 from sqlalchemy.orm.exc import NoResultFound
-from typing import Union
+from typing import Dict, Union
 
 from db import DB
+from hashing import get_hashing_executor
 from user import User
 
 
@@ -16,7 +21,10 @@ class Auth:
     def __init__(self):
         """Initialize Auth class instance
         """
+        self._hasher = get_hashing_executor()
         self._db = DB()
+        target_ms = float(getenv('BCRYPT_TARGET_MS', 250))
+        self._rounds = _calibrate_rounds(target_ms)
 
     def register_user(self, email: str, password: str) -> User:
         """Register a new user
@@ -29,7 +37,8 @@ class Auth:
         try:
             user = self._db.find_user_by(email=email)
         except NoResultFound:
-            new_user = self._db.add_user(email, _hash_password(password))
+            new_user = self._db.add_user(
+                email, self._hasher.hash_password(password, self._rounds))
             return new_user
         else:
             raise ValueError(f'User {email} already exists')
@@ -41,11 +50,17 @@ class Auth:
             password (str): returning user's password
         Return:
             (bool): True if valid password for email else False
+        Hashes created with a lower work factor than the calibrated one are
+        upgraded on a successful login
         """
         try:
             user = self._db.find_user_by(email=email)
-            if bcrypt.checkpw(password.encode(),
-                              user.hashed_password):
+            if self._hasher.check_password(password, user.hashed_password):
+                if _hash_rounds(user.hashed_password) < self._rounds:
+                    self._db.update_user(
+                        user.id,
+                        hashed_password=self._hasher.hash_password(
+                            password, self._rounds))
                 return True
             return False
         except NoResultFound:
@@ -63,8 +78,9 @@ class Auth:
         except Exception:
             return None
         else:
-            user.session_id = _generate_uuid()
-            return user.session_id
+            session_id = _generate_uuid()
+            self._db.update_user(user.id, session_id=session_id)
+            return session_id
 
     def get_user_from_session_id(self, session_id: str) -> Union[User, None]:
         """Fetch user using Session ID
@@ -93,6 +109,18 @@ class Auth:
             return None
         return None
 
+    def release_db_session(self) -> None:
+        """Release the database session of the current thread
+        """
+        self._db.remove_session()
+
+    def hashing_metrics(self) -> Dict[str, int]:
+        """Report the load of the password hashing executor
+        Return:
+            (dict): queue depth and job counters of the executor
+        """
+        return self._hasher.metrics()
+
     def get_reset_password_token(self, email: str) -> str:
         """Generate user reset password token
         Args:
@@ -105,8 +133,9 @@ class Auth:
         except Exception:
             raise ValueError
         else:
-            user.reset_token = _generate_uuid()
-            return user.reset_token
+            reset_token = _generate_uuid()
+            self._db.update_user(user.id, reset_token=reset_token)
+            return reset_token
 
     def update_password(self, reset_token: str, password: str) -> None:
         """Update user password using reset token
@@ -119,8 +148,10 @@ class Auth:
         except Exception:
             raise ValueError
         else:
-            user.hashed_password = _hash_password(password)
-            user.reset_token = None
+            hashed_password = self._hasher.hash_password(password,
+                                                         self._rounds)
+            self._db.update_user(user.id, hashed_password=hashed_password,
+                                 reset_token=None)
 
 
 def _generate_uuid() -> str:
@@ -131,11 +162,43 @@ def _generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
-def _hash_password(password: str) -> bytes:
+def _hash_password(password: str, rounds: int = 12) -> bytes:
     """Hash password input
     Args:
         password (str): user password
+        rounds (int): bcrypt work factor
     Return:
         (bytes): salted hash of input password
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds))
+
+
+def _hash_rounds(hashed_password: bytes) -> int:
+    """Read the work factor of a bcrypt hash
+    Args:
+        hashed_password (bytes): salted hash of a password
+    Return:
+        (int): work factor the hash was created with
+    """
+    return int(hashed_password.split(b'$')[2])
+
+
+@lru_cache(maxsize=None)
+def _calibrate_rounds(target_ms: float, min_rounds: int = 10) -> int:
+    """Pick the bcrypt work factor matching a target hashing time
+    Args:
+        target_ms (float): target milliseconds per hash on this machine
+        min_rounds (int): lowest work factor ever returned
+    Return:
+        (int): highest work factor hashing within target_ms
+    """
+    sample_rounds = 8
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(sample_rounds))
+        samples.append(time.perf_counter() - start)
+    elapsed_ms = max(min(samples) * 1000, 1e-3)
+    # each extra round doubles the cost of a hash
+    rounds = sample_rounds + math.floor(math.log2(target_ms / elapsed_ms))
+    return max(min_rounds, min(rounds, 31))
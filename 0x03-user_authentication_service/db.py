@@ -1,36 +1,92 @@
 #!/usr/bin/env python3
 """DB module
 """
-from sqlalchemy import create_engine, select
+from os import getenv
+from sqlalchemy import create_engine, event, inspect, select
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool, StaticPool
 from typing import Dict
 
 from user import Base, User
 
+# SQLite pragmas applied to every new connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
 
 class DB:
     """DB class
     """
-    def __init__(self) -> None:
+    def __init__(self, url: str = None, reset: bool = None) -> None:
         """Initialize a new DB instance
+        Args:
+            url (str): engine URL, defaults to DB_URL or sqlite:///a.db
+            reset (bool): drop and recreate all tables, defaults to True
+                          unless DB_RESET is 0; otherwise tables are only
+                          created when the schema doesn't match
+        """
+        if url is None:
+            url = getenv('DB_URL', "sqlite:///a.db")
+        if reset is None:
+            reset = getenv('DB_RESET', '1') != '0'
+        self._engine = _create_engine(url)
+        if self._engine.dialect.name == 'sqlite':
+            event.listen(self._engine, 'connect', _set_sqlite_pragmas)
+        if reset:
+            Base.metadata.drop_all(self._engine)
+            Base.metadata.create_all(self._engine)
+        elif not self._schema_matches():
+            Base.metadata.create_all(self._engine)
+            self._create_missing_indexes()
+        self._sessions = scoped_session(sessionmaker(bind=self._engine))
+
+    def _schema_matches(self) -> bool:
+        """Check every model table exists with the model's columns and
+        indexes
+        Return:
+            True if no schema change is needed else False
+        """
+        inspector = inspect(self._engine)
+        existing = set(inspector.get_table_names())
+        for name, table in Base.metadata.tables.items():
+            if name not in existing:
+                return False
+            columns = {column['name'] for column in
+                       inspector.get_columns(name)}
+            if columns != set(table.columns.keys()):
+                return False
+            indexes = {index['name'] for index in
+                       inspector.get_indexes(name)}
+            if not {index.name for index in table.indexes} <= indexes:
+                return False
+        return True
+
+    def _create_missing_indexes(self) -> None:
+        """Migrate tables created before their indexes were declared
         """
-        self._engine = create_engine("sqlite:///a.db", echo=False)
-        Base.metadata.drop_all(self._engine)
-        Base.metadata.create_all(self._engine)
-        self.__session = None
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                index.create(self._engine, checkfirst=True)
 
     @property
     def _session(self) -> Session:
-        """Memoized session object
+        """Session object of the current thread
         """
-        if self.__session is None:
-            DBSession = sessionmaker(bind=self._engine)
-            self.__session = DBSession()
-        return self.__session
+        return self._sessions()
+
+    def remove_session(self) -> None:
+        """Close and discard the session of the current thread
+        """
+        self._sessions.remove()
 
     def add_user(self, email: str, hashed_password: str) -> User:
         """Create User instance object and save to database
@@ -80,3 +136,37 @@ class DB:
             else:
                 raise ValueError
         self._session.commit()
+
+
+def _create_engine(url: str):
+    """Create an engine with a connection pool suited to its database
+    Args:
+        url (str): engine URL
+    Return:
+        Engine sharing one connection for in-memory SQLite, otherwise
+        pooling up to DB_POOL_SIZE connections plus DB_MAX_OVERFLOW
+    """
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite':
+        connect_args = {'check_same_thread': False}
+        if url.database in (None, '', ':memory:'):
+            return create_engine(url, echo=False, poolclass=StaticPool,
+                                 connect_args=connect_args)
+    else:
+        connect_args = {}
+    return create_engine(url, echo=False, poolclass=QueuePool,
+                         pool_size=int(getenv('DB_POOL_SIZE', 5)),
+                         max_overflow=int(getenv('DB_MAX_OVERFLOW', 10)),
+                         pool_pre_ping=True, connect_args=connect_args)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune a new SQLite connection
+    Args:
+        dbapi_connection: raw sqlite3 connection being opened
+        connection_record: pool record of the connection
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
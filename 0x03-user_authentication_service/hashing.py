@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+""" Hashing executor module
+"""
+import asyncio
+import atexit
+import bcrypt
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from functools import partial
+from os import getenv
+from typing import Callable, Dict
+
+# Executor shared by every Auth instance, created by get_hashing_executor
+_executor = None
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue stays full for longer than the
+    executor's queue timeout
+    """
+
+
+class HashingExecutor:
+    """HashingExecutor runs bcrypt on a bounded pool of worker processes,
+    so hashing neither holds the GIL of the request threads nor queues
+    without limit. Coroutines are admitted on the event loop by the *_async
+    methods, with the same limits counted separately from threads
+    """
+    def __init__(self, workers: int = None, queue_size: int = None,
+                 queue_timeout: float = None):
+        """Initialize HashingExecutor class instance
+        Args:
+            workers (int): worker processes, 0 to hash in the calling thread
+            queue_size (int): jobs allowed to wait for a free worker
+            queue_timeout (float): seconds to wait for room in the queue
+        """
+        if workers is None:
+            workers = int(getenv('HASH_WORKERS', os.cpu_count() or 1))
+        if queue_size is None:
+            queue_size = int(getenv('HASH_QUEUE_SIZE', 2 * max(workers, 1)))
+        if queue_timeout is None:
+            queue_timeout = float(getenv('HASH_QUEUE_TIMEOUT', 1))
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._async_slots = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._pool = None
+        if workers > 0:
+            # fork keeps workers from re-importing the app's main module;
+            # they are all started now, before the server starts threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('fork'))
+            wait([self._pool.submit(int) for _ in range(workers)])
+            atexit.register(self.shutdown)
+
+    def hash_password(self, password: str, rounds: int = 12) -> bytes:
+        """Hash a password on a worker
+        Args:
+            password (str): user password
+            rounds (int): bcrypt work factor
+        Return:
+            (bytes): salted hash of input password
+        """
+        return self._run(_hashpw, password.encode('utf-8'), rounds)
+
+    def check_password(self, password: str, hashed_password: bytes) -> bool:
+        """Check a password against its hash on a worker
+        Args:
+            password (str): user password
+            hashed_password (bytes): salted hash of a password
+        Return:
+            (bool): True if password matches hashed_password else False
+        """
+        return self._run(bcrypt.checkpw, password.encode('utf-8'),
+                         hashed_password)
+
+    async def hash_password_async(self, password: str,
+                                  rounds: int = 12) -> bytes:
+        """Hash a password on a worker without blocking the event loop
+        Args:
+            password (str): user password
+            rounds (int): bcrypt work factor
+        Return:
+            (bytes): salted hash of input password
+        """
+        return await self._run_async(_hashpw, password.encode('utf-8'),
+                                     rounds)
+
+    async def check_password_async(self, password: str,
+                                   hashed_password: bytes) -> bool:
+        """Check a password against its hash on a worker without blocking
+        the event loop
+        Args:
+            password (str): user password
+            hashed_password (bytes): salted hash of a password
+        Return:
+            (bool): True if password matches hashed_password else False
+        """
+        return await self._run_async(bcrypt.checkpw, password.encode('utf-8'),
+                                     hashed_password)
+
+    def metrics(self) -> Dict[str, int]:
+        """Report the load of the executor
+        Return:
+            (dict): worker count, queue capacity, jobs running or queued,
+            jobs queued now and at peak, and completed and rejected jobs
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self._in_flight,
+                'queued': max(self._in_flight - self.workers, 0),
+                'peak_queued': self._peak_queued,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(self, func: Callable, *args):
+        """Run func on a worker and wait for its result
+        Raises HashingBusy if no queue slot frees up within queue_timeout
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._reject()
+        self._admit()
+        try:
+            if self._pool is None:
+                return func(*args)
+            future: Future = self._pool.submit(func, *args)
+            return future.result()
+        finally:
+            self._finish()
+            self._slots.release()
+
+    async def _run_async(self, func: Callable, *args):
+        """Run func on a worker and await its result
+        Raises HashingBusy if no queue slot frees up within queue_timeout
+        """
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(
+                max(self.workers, 1) + self.queue_size)
+        try:
+            await asyncio.wait_for(self._async_slots.acquire(),
+                                   self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject()
+        self._admit()
+        try:
+            if self._pool is None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, partial(func, *args))
+            return await asyncio.wrap_future(self._pool.submit(func, *args))
+        finally:
+            self._finish()
+            self._async_slots.release()
+
+    def _reject(self) -> None:
+        """Count a rejected job and raise HashingBusy
+        """
+        with self._lock:
+            self._rejected += 1
+        raise HashingBusy
+
+    def _admit(self) -> None:
+        """Count a job admitted to the queue
+        """
+        with self._lock:
+            self._in_flight += 1
+            queued = self._in_flight - self.workers
+            self._peak_queued = max(self._peak_queued, queued)
+
+    def _finish(self) -> None:
+        """Count a job leaving the queue
+        """
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+
+def get_hashing_executor() -> HashingExecutor:
+    """Return the executor shared by the whole process, created on first
+    call from the HASH_* settings
+    Return:
+        (HashingExecutor): shared hashing executor
+    """
+    global _executor
+    if _executor is None:
+        _executor = HashingExecutor()
+    return _executor
+
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    """Salt and hash an encoded password
+    Args:
+        password (bytes): encoded user password
+        rounds (int): bcrypt work factor
+    Return:
+        (bytes): salted hash of input password
+    """
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
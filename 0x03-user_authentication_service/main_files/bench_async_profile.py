@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: thousands of concurrent GET /profile connections held open
+against async_app served by Hypercorn in a single process
+"""
+import asyncio
+import sys
+import time
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from async_app import app
+
+connections = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+port = int(sys.argv[2]) if len(sys.argv) > 2 else 5001
+body = b"email=async%40test.com&password=asyncPwd"
+
+
+async def send(reader, writer, request: bytes) -> bytes:
+    """Send a request on an open connection and return the raw response
+    """
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def post(path: str) -> bytes:
+    """Build a form POST request
+    """
+    return ("POST {} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+            "Content-Type: application/x-www-form-urlencoded\r\n"
+            "Content-Length: {}\r\n\r\n".format(path, len(body))
+            ).encode() + body
+
+
+async def main() -> None:
+    """Serve the app, log in once, then hold connections open and fire
+    a profile request on every one of them at once
+    """
+    config = Config()
+    config.bind = ["127.0.0.1:{}".format(port)]
+    config.backlog = 2 * connections
+    config.accesslog = None
+    stop = asyncio.Event()
+    server = asyncio.create_task(serve(app, config,
+                                       shutdown_trigger=stop.wait))
+    await asyncio.sleep(1)
+
+    for path in ("/users", "/sessions"):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        response = await send(reader, writer, post(path))
+    session_id = response.split(b"session_id=")[1].split(b";")[0].decode()
+    request = ("GET /profile HTTP/1.1\r\nHost: localhost\r\n"
+               "Connection: close\r\nCookie: session_id={}\r\n\r\n"
+               .format(session_id)).encode()
+
+    start = time.perf_counter()
+    opened = await asyncio.gather(*(
+        asyncio.open_connection("127.0.0.1", port)
+        for _ in range(connections)))
+    idle = time.perf_counter() - start
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(
+        send(reader, writer, request) for reader, writer in opened))
+    elapsed = time.perf_counter() - start
+    ok = sum(response.startswith(b"HTTP/1.1 200") for response in responses)
+    print("{} connections opened in {:.2f}s, {}/{} profiles OK in {:.2f}s "
+          "({:.0f} requests/s)".format(connections, idle, ok, connections,
+                                       elapsed, connections / elapsed))
+    stop.set()
+    await server
+
+
+asyncio.run(main())
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: DB cold start with and without resetting the schema
+"""
+import time
+from db import DB
+
+DB(reset=True).add_user("test@test.com", "SuperHashedPwd")
+
+for reset in (True, False):
+    start = time.perf_counter()
+    for _ in range(20):
+        my_db = DB(reset=reset)
+        my_db._engine.dispose()
+    elapsed = (time.perf_counter() - start) / 20
+    print("reset={}: {:.2f} ms per start".format(reset, elapsed * 1000))
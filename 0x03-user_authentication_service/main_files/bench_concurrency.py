@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: concurrent GET /profile requests on a threaded server
+"""
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from werkzeug.serving import make_server
+
+from app import app
+
+clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+server = make_server("127.0.0.1", 0, app, threaded=True)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = "http://127.0.0.1:{}".format(server.server_port)
+
+credentials = {'email': "bench@test.com", 'password': "b3nchPwd"}
+requests.post(url + "/users", data=credentials)
+session_id = requests.post(url + "/sessions",
+                           data=credentials).cookies["session_id"]
+
+
+def client(_) -> int:
+    """Send per_client profile requests and return how many succeeded
+    """
+    ok = 0
+    with requests.Session() as http:
+        http.cookies.set("session_id", session_id)
+        for _ in range(per_client):
+            ok += http.get(url + "/profile").status_code == 200
+    return ok
+
+
+start = time.perf_counter()
+with ThreadPoolExecutor(clients) as executor:
+    succeeded = sum(executor.map(client, range(clients)))
+elapsed = time.perf_counter() - start
+total = clients * per_client
+print("{} clients: {}/{} OK, {:.0f} requests/s".format(
+      clients, succeeded, total, total / elapsed))
+server.shutdown()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: find_user_by(session_id=...) with and without indexes
+"""
+import sys
+import time
+import uuid
+from db import DB
+from user import User
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 1000000]
+
+for size in sizes:
+    my_db = DB("sqlite:///bench_find_user.db", reset=True)
+    session_ids = [str(uuid.uuid4()) for _ in range(size)]
+    with my_db._engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {'email': "user{}@test.com".format(i),
+             'hashed_password': "hashedPwd", 'session_id': session_id}
+            for i, session_id in enumerate(session_ids)])
+
+    for indexed in (True, False):
+        if not indexed:
+            for index in User.__table__.indexes:
+                index.drop(my_db._engine)
+        start = time.perf_counter()
+        for session_id in session_ids[-100:]:
+            my_db.find_user_by(session_id=session_id)
+        elapsed = (time.perf_counter() - start) / 100
+        print("{:>8} rows, {:>9}: {:.3f} ms per lookup".format(
+              size, "indexed" if indexed else "unindexed", elapsed * 1000))
+    my_db._session.close()
+    my_db._engine.dispose()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Load test file: POST /sessions throughput per number of hashing workers
+Set BCRYPT_TARGET_MS=50 for a shorter run
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from werkzeug.serving import make_server
+
+import app
+from hashing import HashingExecutor
+
+cores = os.cpu_count() or 1
+worker_counts = [int(arg) for arg in sys.argv[1:]] or \
+    sorted({1, max(cores // 2, 1), cores})
+clients = 2 * max(worker_counts)
+per_client = 10
+# fork every worker pool before the server starts its threads
+hashers = [HashingExecutor(workers, queue_size=clients, queue_timeout=30)
+           for workers in worker_counts]
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+server = make_server("127.0.0.1", 0, app.app, threaded=True)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = "http://127.0.0.1:{}".format(server.server_port)
+
+credentials = {'email': "load@test.com", 'password': "l0adPwd"}
+requests.post(url + "/users", data=credentials)
+
+
+def client(_) -> int:
+    """Log in per_client times and return how many logins succeeded
+    """
+    ok = 0
+    with requests.Session() as http:
+        for _ in range(per_client):
+            ok += http.post(url + "/sessions",
+                            data=credentials).status_code == 200
+    return ok
+
+
+print("{} cores, {} clients, bcrypt rounds {}".format(
+      cores, clients, app.AUTH._rounds))
+for workers, hasher in zip(worker_counts, hashers):
+    app.AUTH._hasher = hasher
+    client(None)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        succeeded = sum(executor.map(client, range(clients)))
+    elapsed = time.perf_counter() - start
+    hashing = app.AUTH.hashing_metrics()
+    print("{:>3} workers: {:>4} logins OK, {:>7.1f} logins/s, "
+          "peak queue depth {}".format(workers, succeeded,
+                                       succeeded / elapsed,
+                                       hashing["peak_queued"]))
+server.shutdown()